@@ -0,0 +1,35 @@
+"""
+Gunicorn settings, picked up automatically when gunicorn starts in this
+directory (``gunicorn rentmanager.wsgi:application``). Every value can be
+overridden with the GUNICORN_* environment variables below.
+"""
+import multiprocessing
+import os
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+# gthread workers: a few processes with several threads each, so requests
+# waiting on the database or storage don't hold a whole process
+workers = int(os.getenv('GUNICORN_WORKERS', str(min(cpu_count * 2 + 1, 8))))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+
+# Import the app once in the master and fork it, so workers start fast and share memory
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Recycle workers periodically to contain slow memory growth; jitter avoids restarting all at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# Heartbeat files in memory rather than on the container's overlay filesystem
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
@@ -1,10 +1,95 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.admin.utils import model_ngettext
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
 from .models import (
     Tenant, RentAgreement, RentPayment, UtilityType, UtilityBill,
-    MeterType, MeterReading, SystemSettings
+    MeterType, MeterReading, SystemSettings, ExchangeRate, MonthlyConsumption,
+    BuildingInvoice
 )
+from .bill_splitting import split_invoice
+from .bulk_updates import mark_bills_paid, mark_readings_processed, mark_rent_paid, regenerate_ron_amounts
+from .system_settings import validate as validate_setting
+
+
+class TenantAutocompleteFilter(admin.FieldListFilter):
+    """Tenant filter with an autocomplete box instead of a link per tenant"""
+    template = 'admin/rent_app/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f'{field_path}__id__exact'
+        self.lookup_val = params.get(self.lookup_kwarg)
+        super().__init__(field, request, params, model, model_admin, field_path)
+        # A bound form field gives the widget the queryset for the selected option's label
+        self.form_field = forms.ModelChoiceField(
+            queryset=Tenant.objects.select_related('user'),
+            required=False,
+            widget=AutocompleteSelect(field, model_admin.admin_site, attrs={
+                'id': f'filter_{field_path}',
+                'onchange': 'this.form.submit()',
+            }),
+        )
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.lookup_val is None,
+            'query_string': changelist.get_query_string(remove=[self.lookup_kwarg]),
+            'display': 'All',
+            'hidden_params': [
+                (key, value) for key, value in changelist.params.items() if key != self.lookup_kwarg
+            ],
+            # Loads only the selected tenant, if any
+            'widget': self.form_field.widget.render(self.lookup_kwarg, self.lookup_val),
+        }
+
+
+def log_bulk_change(model_admin, request, pks, message):
+    """One admin log entry for a bulk action, listing the changed rows"""
+    if not pks:
+        model_admin.message_user(request, 'No rows needed changing.', messages.WARNING)
+        return
+    opts = model_admin.model._meta
+    LogEntry.objects.log_action(
+        user_id=request.user.pk,
+        content_type_id=ContentType.objects.get_for_model(model_admin.model).pk,
+        object_id=None,
+        object_repr=f'{len(pks)} {model_ngettext(opts, len(pks))}',
+        action_flag=CHANGE,
+        change_message=f'{message}: {_id_ranges(pks)}',
+    )
+    model_admin.message_user(
+        request, f'{message}: {len(pks)} {model_ngettext(opts, len(pks))}.', messages.SUCCESS
+    )
+
+
+def _id_ranges(pks):
+    """'1-3, 7, 9-10' for [1, 2, 3, 7, 9, 10]; keeps the log of large selections short"""
+    ranges = []
+    for pk in sorted(pks):
+        if ranges and pk == ranges[-1][1] + 1:
+            ranges[-1][1] = pk
+        else:
+            ranges.append([pk, pk])
+    return ', '.join(str(first) if first == last else f'{first}-{last}' for first, last in ranges)
+
+
+class AutocompleteFilterMedia:
+    """Adds the select2 assets TenantAutocompleteFilter needs to the changelist"""
+
+    @property
+    def media(self):
+        return super().media + AutocompleteSelect(
+            UtilityBill._meta.get_field('tenant'), self.admin_site
+        ).media
 
 
 class TenantInline(admin.StackedInline):
@@ -18,10 +103,17 @@ class CustomUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'first_name', 'last_name', 'is_staff', 'is_superuser', 'has_tenant_profile')
     list_filter = ('is_staff', 'is_superuser', 'is_active', 'groups')
 
+    def get_queryset(self, request):
+        # Annotated so the changelist doesn't query the tenant profile per row
+        return super().get_queryset(request).annotate(
+            tenant_profile_exists=Exists(Tenant.objects.filter(user=OuterRef('pk')))
+        )
+
     def has_tenant_profile(self, obj):
-        return hasattr(obj, 'tenant')
+        return obj.tenant_profile_exists
     has_tenant_profile.boolean = True
     has_tenant_profile.short_description = 'Has Tenant Profile'
+    has_tenant_profile.admin_order_field = 'tenant_profile_exists'
 
 
 # Unregister the default User admin
@@ -60,6 +152,7 @@ class RentAgreementAdmin(admin.ModelAdmin):
     list_filter = ['is_active', 'start_date']
     search_fields = ['tenant__user__username', 'tenant__user__first_name']
     ordering = ['-start_date']
+    list_select_related = ['tenant__user']
 
 
 @admin.register(RentPayment)
@@ -68,6 +161,17 @@ class RentPaymentAdmin(admin.ModelAdmin):
     list_filter = ['status', 'due_date', 'payment_date']
     search_fields = ['agreement__tenant__user__username']
     ordering = ['-due_date']
+    list_select_related = ['agreement__tenant__user']
+    actions = ['mark_paid_today', 'regenerate_ron']
+
+    @admin.action(description='Mark selected rent payments paid today', permissions=['change'])
+    def mark_paid_today(self, request, queryset):
+        today = timezone.localdate()
+        log_bulk_change(self, request, mark_rent_paid(queryset, today), f'Marked paid on {today}')
+
+    @admin.action(description='Regenerate RON amounts of unpaid rent payments', permissions=['change'])
+    def regenerate_ron(self, request, queryset):
+        log_bulk_change(self, request, regenerate_ron_amounts(queryset), 'Regenerated RON amounts')
 
 
 @admin.register(UtilityType)
@@ -79,11 +183,19 @@ class UtilityTypeAdmin(admin.ModelAdmin):
 
 
 @admin.register(UtilityBill)
-class UtilityBillAdmin(admin.ModelAdmin):
+class UtilityBillAdmin(AutocompleteFilterMedia, admin.ModelAdmin):
     list_display = ['utility_type', 'tenant', 'amount', 'invoice_number', 'due_date', 'status', 'paid_on']
-    list_filter = ['status', 'due_date', 'paid_on', 'utility_type', 'tenant']
+    list_filter = ['status', 'due_date', 'paid_on', 'utility_type', ('tenant', TenantAutocompleteFilter)]
     search_fields = ['tenant__user__username', 'utility_type__name', 'invoice_number']
     ordering = ['-due_date']
+    list_select_related = ['utility_type', 'tenant__user']
+    autocomplete_fields = ['tenant']
+    actions = ['mark_paid_today']
+
+    @admin.action(description='Mark selected utility bills paid today', permissions=['change'])
+    def mark_paid_today(self, request, queryset):
+        today = timezone.localdate()
+        log_bulk_change(self, request, mark_bills_paid(queryset, today), f'Marked paid on {today}')
 
     def get_fields(self, request, obj=None):
         fields = super().get_fields(request, obj)
@@ -93,6 +205,27 @@ class UtilityBillAdmin(admin.ModelAdmin):
         return fields
 
 
+@admin.register(BuildingInvoice)
+class BuildingInvoiceAdmin(admin.ModelAdmin):
+    list_display = ['utility_type', 'amount', 'period_start', 'period_end', 'due_date', 'split_method', 'is_split']
+    list_filter = ['is_split', 'utility_type', 'period_end']
+    search_fields = ['invoice_number', 'utility_type__name']
+    ordering = ['-period_end']
+    readonly_fields = ['is_split']
+    list_select_related = ['utility_type']
+    actions = ['split_into_tenant_bills']
+
+    @admin.action(description='Split into tenant bills')
+    def split_into_tenant_bills(self, request, queryset):
+        for invoice in queryset:
+            try:
+                bills = split_invoice(invoice.pk)
+            except ValueError as exc:
+                self.message_user(request, f'{invoice}: {exc}', messages.ERROR)
+            else:
+                self.message_user(request, f'{invoice}: created {len(bills)} bill(s).', messages.SUCCESS)
+
+
 @admin.register(MeterType)
 class MeterTypeAdmin(admin.ModelAdmin):
     list_display = ['name', 'unit', 'reading_day_start', 'reading_day_end', 'is_active']
@@ -107,10 +240,57 @@ class MeterReadingAdmin(admin.ModelAdmin):
     list_filter = ['is_processed', 'reading_date', 'meter_type']
     search_fields = ['tenant__user__username', 'meter_type__name']
     ordering = ['-reading_date']
+    list_select_related = ['meter_type', 'tenant__user']
+    autocomplete_fields = ['tenant']
+    actions = ['mark_processed']
+
+    @admin.action(description='Mark selected meter readings processed', permissions=['change'])
+    def mark_processed(self, request, queryset):
+        log_bulk_change(self, request, mark_readings_processed(queryset), 'Marked processed')
+
+
+class SystemSettingsForm(forms.ModelForm):
+    class Meta:
+        model = SystemSettings
+        fields = '__all__'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        key, value = cleaned_data.get('key'), cleaned_data.get('value')
+        if key and value is not None:
+            try:
+                validate_setting(key, value)
+            except ValueError as exc:
+                self.add_error('value', str(exc))
+        return cleaned_data
 
 
 @admin.register(SystemSettings)
 class SystemSettingsAdmin(admin.ModelAdmin):
+    form = SystemSettingsForm
     list_display = ['key', 'value', 'updated_at']
     search_fields = ['key', 'description']
     ordering = ['key']
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ['date', 'rate', 'source', 'updated_at']
+    search_fields = ['source']
+    ordering = ['-date']
+
+
+@admin.register(MonthlyConsumption)
+class MonthlyConsumptionAdmin(admin.ModelAdmin):
+    list_display = ['tenant', 'meter_type', 'month', 'consumption', 'reading_count']
+    list_filter = ['meter_type', 'month']
+    search_fields = ['tenant__user__username', 'meter_type__name']
+    ordering = ['-month']
+    list_select_related = ['tenant__user', 'meter_type']
+
+    def has_add_permission(self, request):
+        # Rows are derived from meter readings
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
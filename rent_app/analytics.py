@@ -0,0 +1,218 @@
+"""
+Consumption analytics over meter readings.
+
+``MeterReading`` stores cumulative counter values. Consumption is the
+difference to the previous reading of the same tenant and meter, computed in
+SQL with a ``LAG`` window, and is attributed to the month of the later
+reading. Monthly totals are materialized in ``MonthlyConsumption`` and kept
+current incrementally: a changed reading only recomputes its pair's months
+from the reading's month onward. Rolling means and z-score spikes are
+computed with NumPy over the precomputed series.
+"""
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.db.models import DecimalField, F, Window
+from django.db.models.functions import Lag
+
+from . import tasks
+from .models import MeterReading, MonthlyConsumption
+
+BATCH_SIZE = 1000
+DEFAULT_ROLLING_WINDOW = 3
+DEFAULT_SPIKE_THRESHOLD = 2.5
+
+
+def consumption_series(readings):
+    """
+    Annotate readings with ``previous_value`` and ``consumption`` (delta to
+    the previous reading of the same tenant and meter), oldest first.
+    """
+    previous_value = Window(
+        Lag('reading_value'),
+        partition_by=[F('tenant_id'), F('meter_type_id')],
+        order_by=F('reading_date').asc(),
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    )
+    return readings.annotate(
+        previous_value=previous_value,
+    ).annotate(
+        consumption=F('reading_value') - F('previous_value'),
+    ).order_by('tenant_id', 'meter_type_id', 'reading_date')
+
+
+def refresh_monthly_consumption(tenant_id, meter_type_id, since=None):
+    """Recompute the pair's MonthlyConsumption rows from the month of ``since`` (default: all)"""
+    readings = MeterReading.objects.filter(tenant_id=tenant_id, meter_type_id=meter_type_id)
+    start_month = since.replace(day=1) if since else None
+    if start_month:
+        # Include the last earlier reading so the first delta of the month has a base
+        baseline = readings.filter(
+            reading_date__lt=start_month
+        ).order_by('-reading_date').values_list('reading_date', flat=True).first()
+        readings = readings.filter(reading_date__gte=baseline or start_month)
+
+    rows = consumption_series(readings).values_list(
+        'tenant_id', 'meter_type_id', 'reading_date', 'consumption'
+    )
+    monthly = [row for row in monthly_rows(rows) if not start_month or row.month >= start_month]
+
+    with transaction.atomic():
+        stale = MonthlyConsumption.objects.filter(tenant_id=tenant_id, meter_type_id=meter_type_id)
+        if start_month:
+            stale = stale.filter(month__gte=start_month)
+        stale.delete()
+        MonthlyConsumption.objects.bulk_create(monthly, batch_size=BATCH_SIZE)
+    return len(monthly)
+
+
+def schedule_refresh(tenant_id, meter_type_id, since=None):
+    """
+    Queue a refresh of the pair's monthly consumption once the transaction
+    commits. A pair changed many times in one transaction is refreshed once,
+    from the earliest change.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _RefreshBatch({(tenant_id, meter_type_id): since})()
+        return
+
+    batch = _open_batch(connection)
+    if batch is None:
+        batch = _RefreshBatch()
+        transaction.on_commit(batch)
+    key = (tenant_id, meter_type_id)
+    if key in batch:
+        since = None if since is None or batch[key] is None else min(since, batch[key])
+    batch[key] = since
+
+
+class _RefreshBatch(dict):
+    """(tenant_id, meter_type_id) -> earliest changed date, sent as tasks on commit"""
+
+    def __call__(self):
+        for (tenant_id, meter_type_id), since in self.items():
+            tasks.refresh_monthly_consumption.delay(tenant_id, meter_type_id, since.isoformat() if since else None)
+
+
+def _open_batch(connection):
+    # The batch lives in the connection's commit callbacks, so rolling back the transaction, or
+    # the savepoint it was queued in, discards it together with the changes it would refresh
+    for _, callback, _ in reversed(connection.run_on_commit):
+        if isinstance(callback, _RefreshBatch):
+            return callback
+    return None
+
+
+def rebuild_monthly_consumption():
+    """Rebuild the whole table from one partitioned LAG query; returns the row count"""
+    rows = consumption_series(MeterReading.objects.all()).values_list(
+        'tenant_id', 'meter_type_id', 'reading_date', 'consumption'
+    )
+    created = 0
+    with transaction.atomic():
+        MonthlyConsumption.objects.all().delete()
+        batch = []
+        for row in monthly_rows(rows.iterator(chunk_size=BATCH_SIZE)):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                MonthlyConsumption.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        MonthlyConsumption.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def monthly_rows(rows):
+    """Sum ordered (tenant_id, meter_type_id, reading_date, consumption) rows per month"""
+    current = None
+    for tenant_id, meter_type_id, reading_date, consumption in rows:
+        if consumption is None:
+            # First reading of a pair, nothing to compare with
+            continue
+        key = (tenant_id, meter_type_id, reading_date.replace(day=1))
+        if current and current[0] != key:
+            yield _monthly_row(*current)
+            current = None
+        if current is None:
+            current = [key, Decimal('0'), 0]
+        current[1] += consumption
+        current[2] += 1
+    if current:
+        yield _monthly_row(*current)
+
+
+def _monthly_row(key, consumption, reading_count):
+    tenant_id, meter_type_id, month = key
+    return MonthlyConsumption(
+        tenant_id=tenant_id,
+        meter_type_id=meter_type_id,
+        month=month,
+        consumption=Decimal(consumption).quantize(Decimal('0.01')),
+        reading_count=reading_count,
+    )
+
+
+def rolling_mean(values, window=DEFAULT_ROLLING_WINDOW):
+    """Trailing mean over ``window`` values; NaN until the window is full"""
+    values = np.asarray(values, dtype=float)
+    result = np.full(values.shape, np.nan)
+    if window <= 0 or len(values) < window:
+        return result
+    cumsum = np.cumsum(np.insert(values, 0, 0.0))
+    result[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    return result
+
+
+def z_scores(values):
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return values
+    std = values.std()
+    if std == 0:
+        return np.zeros(values.shape)
+    return (values - values.mean()) / std
+
+
+def find_spikes(values, threshold=DEFAULT_SPIKE_THRESHOLD):
+    """Indexes of values whose absolute z-score exceeds ``threshold``"""
+    return np.flatnonzero(np.abs(z_scores(values)) > threshold)
+
+
+def consumption_report(tenant, meter_type, window=DEFAULT_ROLLING_WINDOW, threshold=DEFAULT_SPIKE_THRESHOLD):
+    """Monthly consumption of one meter with rolling mean, z-scores and spike flags"""
+    return tenant_consumption_reports(tenant, [meter_type.id], window, threshold)[meter_type.id]
+
+
+def tenant_consumption_reports(tenant, meter_type_ids, window=DEFAULT_ROLLING_WINDOW,
+                               threshold=DEFAULT_SPIKE_THRESHOLD):
+    """``consumption_report`` for each of the meter types, from one query"""
+    series = {meter_type_id: ([], []) for meter_type_id in meter_type_ids}
+    for meter_type_id, month, value in MonthlyConsumption.objects.filter(
+        tenant=tenant, meter_type_id__in=meter_type_ids
+    ).order_by('meter_type_id', 'month').values_list('meter_type_id', 'month', 'consumption'):
+        months, consumption = series[meter_type_id]
+        months.append(month)
+        consumption.append(value)
+    return {
+        meter_type_id: _report(months, consumption, window, threshold)
+        for meter_type_id, (months, consumption) in series.items()
+    }
+
+
+def _report(months, consumption, window, threshold):
+    means = rolling_mean(consumption, window)
+    scores = z_scores(consumption)
+    spikes = set(find_spikes(consumption, threshold).tolist())
+    return [
+        {
+            'month': month,
+            'consumption': value,
+            'rolling_mean': None if np.isnan(mean) else round(float(mean), 2),
+            'z_score': round(float(score), 2),
+            'spike': index in spikes,
+        }
+        for index, (month, value, mean, score) in enumerate(zip(months, consumption, means, scores))
+    ]
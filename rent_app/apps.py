@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
 
 
 class RentAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rent_app'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+
+        if settings.SQLITE_TUNING:
+            from .sqlite_tuning import configure_connection
+            connection_created.connect(configure_connection, dispatch_uid='rent_app_sqlite_tuning')
+
+        if settings.PERF_METRICS:
+            from .metrics import install_sql_wrapper
+            connection_created.connect(install_sql_wrapper, dispatch_uid='rent_app_perf_metrics')
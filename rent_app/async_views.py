@@ -0,0 +1,200 @@
+"""
+Async versions of the tenant views, used when ``ASYNC_VIEWS`` is on (see
+``rent_app.urls``) and the app is served over ASGI (``rentmanager.asgi``).
+
+Django 4.2 runs async ORM calls one after another on a single thread, so
+independent queries are instead run with ``sync_to_async(thread_sensitive=False)``
+and gathered: each runs in its own worker thread with its own database
+connection. Blocking work that isn't a query (cache access, template
+rendering, opening files) is also pushed off the event loop.
+"""
+import asyncio
+from datetime import timedelta
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.db import close_old_connections
+from django.http import Http404
+from django.shortcuts import redirect, render
+from django.utils import timezone
+
+from .bills import tenant_bill_summary
+from .caching import get_dashboard_context, set_dashboard_context
+from .downloads import file_etag, serve_file
+from .models import MeterType, RentAgreement, RentPayment, Tenant, UtilityBill
+from .pagination import keyset_page
+from .reading_periods import get_calendar
+from .views import (
+    PAYMENT_HISTORY_PAGE_SIZE, _build_dashboard_context, _latest_readings,
+    _meter_readings_context, _recent_readings, _rent_overview
+)
+
+arender = sync_to_async(render)
+
+
+def async_login_required(view):
+    """``login_required`` for async views; resolves ``request.user`` off the event loop"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not await sync_to_async(lambda: request.user.is_authenticated)():
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def gather_queries(*funcs):
+    """Run independent blocking callables concurrently, in separate threads"""
+    return await asyncio.gather(*(sync_to_async(_with_connection(func), thread_sensitive=False)() for func in funcs))
+
+
+def _with_connection(func):
+    def run():
+        try:
+            return func()
+        finally:
+            # Executor threads outlive the request, so apply CONN_MAX_AGE here
+            close_old_connections()
+    return run
+
+
+async def _get_tenant(user):
+    tenant = await Tenant.objects.filter(user=user).afirst()
+    if tenant is None:
+        raise Http404('No Tenant matches the given query.')
+    return tenant
+
+
+async def _get_agreement(tenant):
+    agreement = await RentAgreement.objects.filter(tenant=tenant, is_active=True).afirst()
+    if agreement is None:
+        raise Http404('No RentAgreement matches the given query.')
+    return agreement
+
+
+@async_login_required
+async def dashboard(request):
+    """Main dashboard view"""
+    if request.user.is_superuser:
+        return redirect('/admin/')
+
+    context = await sync_to_async(get_dashboard_context)(request.user.id)
+    if context is None:
+        tenant = await _get_tenant(request.user)
+        rent_overview, bill_summary, recent_readings = await gather_queries(
+            lambda: _rent_overview(tenant),
+            lambda: tenant_bill_summary(tenant, paid_limit=0),
+            lambda: _recent_readings(tenant),
+        )
+        context = _build_dashboard_context(tenant, rent_overview, bill_summary, recent_readings)
+        await sync_to_async(set_dashboard_context)(request.user.id, context)
+
+    return await arender(request, 'rent_app/dashboard.html', context)
+
+
+@async_login_required
+async def rent_status(request):
+    """Rent status and payment history"""
+    if request.user.is_superuser:
+        return redirect('/admin/')
+
+    tenant = await _get_tenant(request.user)
+    rent_agreement = await _get_agreement(tenant)
+
+    current_date = timezone.localdate()
+    month_start = current_date.replace(day=1)
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+    current_month_payment, (payments, next_cursor) = await gather_queries(
+        lambda: RentPayment.objects.filter(
+            agreement=rent_agreement,
+            due_date__gte=month_start,
+            due_date__lt=next_month_start
+        ).first(),
+        lambda: keyset_page(
+            RentPayment.objects.filter(agreement=rent_agreement),
+            request.GET.get('after'),
+            PAYMENT_HISTORY_PAGE_SIZE
+        ),
+    )
+
+    context = {
+        'rent_agreement': rent_agreement,
+        'current_month_payment': current_month_payment,
+        'all_payments': payments,
+        'next_cursor': next_cursor,
+        'is_first_page': 'after' not in request.GET,
+        'current_date': current_date,
+    }
+
+    return await arender(request, 'rent_app/rent_status.html', context)
+
+
+@async_login_required
+async def utility_bills(request):
+    """Utility bills view"""
+    if request.user.is_superuser:
+        return redirect('/admin/')
+
+    tenant = await _get_tenant(request.user)
+    bill_summary = await sync_to_async(tenant_bill_summary)(tenant, paid_limit=10)
+
+    context = {
+        'unpaid_bills': bill_summary['unpaid'],
+        'paid_bills': bill_summary['paid'],
+        'overdue_bills': bill_summary['overdue'],
+        'bill_counts': bill_summary['counts'],
+        'bill_totals': bill_summary['totals'],
+    }
+
+    return await arender(request, 'rent_app/utility_bills.html', context)
+
+
+@async_login_required
+async def download_bill(request, bill_id):
+    """Download utility bill file"""
+    if request.user.is_superuser:
+        return redirect('/admin/')
+
+    tenant = await _get_tenant(request.user)
+    bill = await UtilityBill.objects.select_related('utility_type').filter(id=bill_id, tenant=tenant).afirst()
+    if bill is None:
+        raise Http404('No UtilityBill matches the given query.')
+
+    if not bill.bill_file:
+        messages.error(request, "No file attached to this bill.")
+        return redirect('rent_app:utility_bills')
+
+    # Opening the file and reading its size block, so do it in a thread
+    filename = f'{bill.utility_type.name}_{bill.due_date}.pdf'
+    response = await sync_to_async(serve_file)(
+        request, bill.bill_file, filename, file_etag(bill.bill_file, bill.updated_at)
+    )
+    if response.streaming:
+        # Django 4.2 would read a sync iterator into a list before sending it over ASGI
+        response.streaming_content = _read_chunks(response.streaming_content)
+    return response
+
+
+async def _read_chunks(chunks):
+    """Yield the chunks of a blocking iterator, reading each one in a thread"""
+    read = sync_to_async(next)
+    while (chunk := await read(chunks, None)) is not None:
+        yield chunk
+
+
+@async_login_required
+async def meter_readings(request):
+    """Meter readings view"""
+    if request.user.is_superuser:
+        return redirect('/admin/')
+
+    tenant = await _get_tenant(request.user)
+    latest_readings, meter_types, calendar = await gather_queries(
+        lambda: _latest_readings(tenant),
+        lambda: list(MeterType.objects.filter(is_active=True)),
+        get_calendar,
+    )
+    context = _meter_readings_context(latest_readings, meter_types, calendar)
+
+    return await arender(request, 'rent_app/meter_readings.html', context)
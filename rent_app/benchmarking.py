@@ -0,0 +1,83 @@
+"""
+Summaries and saved baselines for the benchmark commands.
+
+``--save`` writes a run's per-page results to the JSON file given with
+``--baseline``; later runs with the same ``--baseline`` print the change of
+each metric and fail when latency or peak memory grew by more than
+``--max-regression`` or a page runs more queries than before.
+"""
+import json
+import statistics
+from pathlib import Path
+
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+# Metrics compared against a baseline; query counts are deterministic, so any increase counts
+RELATIVE_METRICS = ('p50', 'p95', 'peak_kib')
+EXACT_METRICS = ('queries',)
+
+
+def latency_summary(timings):
+    """p50, p95 and max of durations in seconds, as milliseconds"""
+    if not timings:
+        return {'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    quantiles = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+    return {
+        'p50': round(quantiles[49] * 1000, 2),
+        'p95': round(quantiles[94] * 1000, 2),
+        'max': round(max(timings) * 1000, 2),
+    }
+
+
+def compare(results, baseline, max_regression):
+    """(page, metric, before, after, regressed) for every metric present in both runs"""
+    rows = []
+    for page, values in results.items():
+        before = baseline.get(page, {})
+        for metric in RELATIVE_METRICS + EXACT_METRICS:
+            if metric not in values or not before.get(metric):
+                continue
+            old, new = before[metric], values[metric]
+            limit = old if metric in EXACT_METRICS else old * (1 + max_regression)
+            rows.append((page, metric, old, new, new > limit))
+    return rows
+
+
+def handle_baseline(command, results, options, **meta):
+    """Save ``results`` or compare them with the baseline, as the command's options ask"""
+    path = options['baseline']
+    if not path:
+        if options['save']:
+            raise CommandError('--save needs --baseline')
+        return
+    path = Path(path)
+
+    if options['save']:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(
+            {'saved_at': timezone.now().isoformat(), **meta, 'results': results}, indent=2, sort_keys=True
+        ) + '\n')
+        command.stdout.write(command.style.SUCCESS(f'Saved baseline to {path}'))
+        return
+
+    if not path.exists():
+        raise CommandError(f'No baseline at {path}; create one with --save')
+    baseline = json.loads(path.read_text())
+    command.stdout.write(f"\nCompared with {path} (saved {baseline.get('saved_at', '?')}):")
+    rows = compare(results, baseline['results'], options['max_regression'])
+    for page, metric, old, new, regressed in rows:
+        change = (new - old) / old * 100
+        line = f'{page:<24} {metric:<9} {old:>10} -> {new:>10}  {change:+6.1f}%'
+        command.stdout.write(command.style.ERROR(line + '  REGRESSION') if regressed else line)
+
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        raise CommandError(f'{regressions} regression(s) against the baseline')
+
+
+def add_baseline_arguments(parser):
+    parser.add_argument('--baseline', help='JSON file to compare the results with (or write with --save)')
+    parser.add_argument('--save', action='store_true', help='Write the results to --baseline instead of comparing')
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help='Allowed relative growth of latency and peak memory before failing (default 0.25)')
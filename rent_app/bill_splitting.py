@@ -0,0 +1,153 @@
+"""
+Split a building-level supplier invoice into tenant utility bills.
+
+Metered utilities (a ``MeterType`` with the same name as the ``UtilityType``)
+are allocated by each active tenant's consumption over the invoice period:
+the last reading dated inside the period minus the last reading before it
+(or the first reading inside it). Other utilities, and ``Condominio`` and
+``Internet`` in automatic mode, are split in equal shares.
+
+Amounts are allocated in bani with the largest remainder method, ties going
+to the lower tenant id, so the bills always add up to the invoice and the
+same input always gives the same bills. All bills are written with one
+``bulk_create`` and the readings of the period are marked processed with
+one ``update()``.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .caching import invalidate_dashboards
+from .models import BuildingInvoice, MeterReading, MeterType, Tenant, UtilityBill
+
+EQUAL_SHARE_UTILITIES = {'condominio', 'internet'}
+
+
+def allocate(amount, weights):
+    """
+    Split ``amount`` (RON) over ``{key: weight}`` in whole bani; the shares
+    sum to ``amount`` exactly. Keys must be orderable for tie-breaking.
+    """
+    cents = int((Decimal(amount) * 100).quantize(Decimal('1')))
+    # Scale weights to integers so the arithmetic is exact
+    scaled = {key: int((Decimal(weight) * 100).quantize(Decimal('1'))) for key, weight in weights.items()}
+    total = sum(scaled.values())
+    if total <= 0:
+        raise ValueError('Nothing to allocate the amount by.')
+
+    shares = {}
+    remainders = []
+    for key, weight in scaled.items():
+        shares[key], remainder = divmod(cents * weight, total)
+        remainders.append((-remainder, key))
+    for _, key in sorted(remainders)[:cents - sum(shares.values())]:
+        shares[key] += 1
+    return {key: Decimal(share).scaleb(-2) for key, share in shares.items()}
+
+
+def split_method(invoice):
+    """'consumption' or 'equal', resolving 'auto' from the utility type"""
+    if invoice.split_method != 'auto':
+        return invoice.split_method
+    name = invoice.utility_type.name
+    if name.lower() in EQUAL_SHARE_UTILITIES or not _meter_type_for(name):
+        return 'equal'
+    return 'consumption'
+
+
+def tenant_consumption(meter_type, period_start, period_end):
+    """{tenant_id: consumption} of active tenants over the period, in one query"""
+    readings = MeterReading.objects.filter(tenant=OuterRef('pk'), meter_type=meter_type)
+    in_period = readings.filter(reading_date__range=(period_start, period_end))
+    rows = Tenant.objects.filter(is_active=True).annotate(
+        last_value=Subquery(in_period.order_by('-reading_date').values('reading_value')[:1]),
+        first_value=Subquery(in_period.order_by('reading_date').values('reading_value')[:1]),
+        previous_value=Subquery(
+            readings.filter(reading_date__lt=period_start).order_by('-reading_date').values('reading_value')[:1]
+        ),
+    ).order_by('pk').values_list('pk', 'last_value', 'first_value', 'previous_value')
+
+    consumption = {}
+    for tenant_id, last_value, first_value, previous_value in rows:
+        if last_value is None:
+            consumption[tenant_id] = Decimal('0')
+            continue
+        base = previous_value if previous_value is not None else first_value
+        consumption[tenant_id] = max(last_value - base, Decimal('0'))
+    return consumption
+
+
+def split_invoice(invoice_id):
+    """
+    Create the tenant bills of a building invoice; returns the created bills.
+    Raises ValueError when the invoice was already split or can't be allocated.
+    """
+    with transaction.atomic():
+        invoice = BuildingInvoice.objects.select_for_update().select_related('utility_type').get(pk=invoice_id)
+        if invoice.is_split:
+            raise ValueError(f'Invoice {invoice} has already been split.')
+        if invoice.period_end < invoice.period_start:
+            raise ValueError('The period ends before it starts.')
+
+        method = split_method(invoice)
+        meter_type = None
+        if method == 'consumption':
+            meter_type = _meter_type_for(invoice.utility_type.name)
+            if meter_type is None:
+                raise ValueError(f'No meter type named "{invoice.utility_type.name}" to split by.')
+            weights = tenant_consumption(meter_type, invoice.period_start, invoice.period_end)
+            if not any(weights.values()):
+                raise ValueError('No consumption recorded in the invoice period.')
+        else:
+            weights = {
+                tenant_id: 1
+                for tenant_id in Tenant.objects.filter(is_active=True).order_by('pk').values_list('pk', flat=True)
+            }
+            if not weights:
+                raise ValueError('There are no active tenants.')
+
+        shares = allocate(invoice.amount, weights)
+        total_weight = sum(weights.values())
+        bills = [
+            UtilityBill(
+                utility_type=invoice.utility_type,
+                tenant_id=tenant_id,
+                amount=amount,
+                due_date=invoice.due_date,
+                bill_date=invoice.bill_date,
+                bill_file=invoice.bill_file.name or None,
+                invoice_number=invoice.invoice_number,
+                building_invoice=invoice,
+                notes=_share_note(meter_type, weights[tenant_id], total_weight, len(weights)),
+            )
+            for tenant_id, amount in sorted(shares.items())
+            if amount > 0
+        ]
+        UtilityBill.objects.bulk_create(bills)
+
+        now = timezone.now()
+        if meter_type:
+            MeterReading.objects.filter(
+                meter_type=meter_type,
+                tenant_id__in=weights.keys(),
+                reading_date__range=(invoice.period_start, invoice.period_end),
+                is_processed=False,
+            ).update(is_processed=True, updated_at=now)
+
+        BuildingInvoice.objects.filter(pk=invoice.pk).update(is_split=True, updated_at=now)
+
+    # bulk_create and update() skip signals
+    invalidate_dashboards(weights.keys())
+    return bills
+
+
+def _meter_type_for(name):
+    return MeterType.objects.filter(name__iexact=name).first()
+
+
+def _share_note(meter_type, weight, total_weight, tenant_count):
+    if meter_type is None:
+        return f'Equal share (1/{tenant_count}) of the building invoice'
+    return f'Share of the building invoice: {weight} of {total_weight} {meter_type.unit}'
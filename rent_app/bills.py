@@ -0,0 +1,53 @@
+"""
+Per-tenant utility bill summary shared by the dashboard and the bills page.
+
+Counts and totals per status come from one grouped aggregate and the listed
+bills from one ordered query (recent paid bills are picked with a
+``ROW_NUMBER`` window), which is partitioned by status in Python.
+"""
+from decimal import Decimal
+
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import RowNumber
+
+from .models import UtilityBill
+
+OPEN_STATUSES = ['unpaid', 'overdue']
+
+
+def tenant_bill_summary(tenant, paid_limit=10):
+    """
+    Return counts, totals and listed bills per status for ``tenant``.
+    Open bills are listed oldest due first, the last ``paid_limit`` paid bills
+    newest first.
+    """
+    bills = UtilityBill.objects.filter(tenant=tenant)
+
+    counts = {status: 0 for status, _ in UtilityBill.STATUS_CHOICES}
+    totals = {status: Decimal('0.00') for status, _ in UtilityBill.STATUS_CHOICES}
+    for row in bills.order_by().values('status').annotate(count=Count('id'), total=Sum('amount')):
+        counts[row['status']] = row['count']
+        totals[row['status']] = row['total'].quantize(Decimal('0.01'))
+
+    rows = bills.select_related('utility_type')
+    if paid_limit:
+        rows = rows.annotate(
+            recency=Window(RowNumber(), partition_by=F('status'), order_by=F('due_date').desc())
+        ).filter(Q(status__in=OPEN_STATUSES) | Q(status='paid', recency__lte=paid_limit))
+    else:
+        rows = rows.filter(status__in=OPEN_STATUSES)
+
+    listed = {status: [] for status, _ in UtilityBill.STATUS_CHOICES}
+    for bill in rows.order_by('due_date', 'id'):
+        listed[bill.status].append(bill)
+    listed['paid'].reverse()
+
+    return {
+        'counts': counts,
+        'totals': totals,
+        'unpaid': listed['unpaid'],
+        'overdue': listed['overdue'],
+        'paid': listed['paid'],
+        'open': sorted(listed['unpaid'] + listed['overdue'], key=lambda bill: (bill.due_date, bill.id)),
+        'open_count': sum(counts[status] for status in OPEN_STATUSES),
+    }
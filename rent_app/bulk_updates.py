@@ -0,0 +1,61 @@
+"""
+Set-based updates behind the admin's bulk actions.
+
+Each function changes every matching row with a single ``update()`` in a
+transaction, regardless of how many rows are selected. RON amounts are the
+exception: they are computed with ``eur_to_ron`` so they round exactly like
+amounts converted elsewhere, and written back with one ``bulk_update()``.
+Both skip ``auto_now`` and model signals, so ``updated_at`` is set explicitly
+and the affected tenants' dashboards are dropped once afterwards. The
+primary keys of the changed rows are returned for the audit log.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import invalidate_dashboards
+from .exchange_rates import eur_to_ron, get_rate
+from .models import RentPayment
+
+
+def mark_bills_paid(queryset, day=None):
+    """Mark the unpaid and overdue utility bills paid on ``day`` (default today)"""
+    return _update(queryset.exclude(status='paid'), 'tenant_id',
+                   status='paid', paid_on=day or timezone.localdate())
+
+
+def mark_rent_paid(queryset, day=None):
+    """Mark the pending and overdue rent payments paid on ``day`` (default today)"""
+    return _update(queryset.exclude(status='paid'), 'agreement__tenant_id',
+                   status='paid', payment_date=day or timezone.localdate())
+
+
+def mark_readings_processed(queryset):
+    return _update(queryset.filter(is_processed=False), 'tenant_id', is_processed=True)
+
+
+def regenerate_ron_amounts(queryset):
+    """Recompute the RON amount of unpaid rent payments at the rate of their due date"""
+    now = timezone.now()
+    with transaction.atomic():
+        payments = list(
+            queryset.exclude(status='paid').select_related('agreement')
+            .only('amount_eur', 'due_date', 'agreement__tenant_id')
+        )
+        for payment in payments:
+            payment.exchange_rate = get_rate(payment.due_date)
+            payment.amount_ron = eur_to_ron(payment.amount_eur, payment.due_date)
+            payment.updated_at = now
+        RentPayment.objects.bulk_update(payments, ['exchange_rate', 'amount_ron', 'updated_at'], batch_size=500)
+    if payments:
+        invalidate_dashboards({payment.agreement.tenant_id for payment in payments})
+    return [payment.pk for payment in payments]
+
+
+def _update(queryset, tenant_field, **values):
+    with transaction.atomic():
+        rows = list(queryset.order_by().values_list('pk', tenant_field))
+        if rows:
+            queryset.update(updated_at=timezone.now(), **values)
+    if rows:
+        invalidate_dashboards({tenant_id for _, tenant_id in rows})
+    return [pk for pk, _ in rows]
@@ -0,0 +1,36 @@
+"""
+Per-tenant dashboard cache.
+
+The dashboard context is stored in Django's cache framework under a key per
+user. ``rent_app.signals`` drops the entry whenever one of the rows shown on
+the dashboard changes; code that bypasses model signals (``update()``,
+``bulk_create()``) must call ``invalidate_dashboards`` itself.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Tenant
+
+DASHBOARD_KEY = 'rent_app:dashboard:{user_id}'
+
+
+def dashboard_cache_key(user_id):
+    return DASHBOARD_KEY.format(user_id=user_id)
+
+
+def get_dashboard_context(user_id):
+    return cache.get(dashboard_cache_key(user_id))
+
+
+def set_dashboard_context(user_id, context):
+    cache.set(dashboard_cache_key(user_id), context, settings.DASHBOARD_CACHE_TIMEOUT)
+
+
+def invalidate_dashboards(tenant_ids):
+    """Drop the cached dashboards of the given tenants"""
+    user_ids = Tenant.objects.filter(pk__in=tenant_ids).values_list('user_id', flat=True)
+    cache.delete_many([dashboard_cache_key(user_id) for user_id in user_ids])
+
+
+def invalidate_user_dashboard(user_id):
+    cache.delete(dashboard_cache_key(user_id))
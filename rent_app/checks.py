@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Cached dashboards and settings are invalidated through the cache, which every process must share"""
+    if settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        'The default cache is local to each process.',
+        hint=(
+            'Invalidations from other gunicorn workers and from Celery never reach this process, '
+            'so tenants see stale dashboards. Set CACHE_BACKEND=redis (or file) in production.'
+        ),
+        id='rent_app.W001',
+    )]
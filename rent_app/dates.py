@@ -0,0 +1,26 @@
+"""Calendar month helpers"""
+import calendar
+from datetime import date
+
+
+def month_end(day):
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def add_months(day, months):
+    """First day of the month ``months`` after the month of ``day``"""
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    return date(year, month + 1, 1)
+
+
+def clamp_day(month, day_of_month):
+    """``day_of_month`` in the month of ``month``, moved back to the last day for short months"""
+    return month.replace(day=min(day_of_month, month_end(month).day))
+
+
+def month_range(first, last):
+    """Yield the first day of every month from ``first`` to ``last`` inclusive"""
+    month = first.replace(day=1)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
@@ -0,0 +1,134 @@
+"""
+Streaming file downloads with HTTP Range and ETag support.
+
+Files are never read into memory as a whole: full downloads go through
+``FileResponse`` and byte ranges through a chunked ``StreamingHttpResponse``.
+When the storage backend can sign URLs (Cloudflare R2 through
+``S3Boto3Storage``) the client is redirected to a short-lived presigned URL
+instead, so the bytes never pass through the app server.
+"""
+import hashlib
+import posixpath
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header
+
+CHUNK_SIZE = 64 * 1024
+CONTENT_TYPE = 'application/octet-stream'
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def file_etag(field_file, last_modified):
+    """Strong ETag derived from the stored file name and the row's modification time"""
+    digest = hashlib.md5(f'{field_file.name}:{last_modified.isoformat()}'.encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def serve_file(request, field_file, filename, etag):
+    """Serve ``field_file`` as an attachment named ``filename``"""
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    if settings.BILL_DOWNLOAD_REDIRECT:
+        return _presigned_redirect(field_file, filename)
+
+    size = field_file.size
+    byte_range = _requested_range(request, etag, size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    field_file.open('rb')
+    if byte_range is None:
+        response = FileResponse(
+            field_file.file,
+            as_attachment=True,
+            filename=filename,
+            content_type=CONTENT_TYPE,
+        )
+        response.block_size = CHUNK_SIZE
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_range(field_file.file, start, end - start + 1),
+            status=206,
+            content_type=CONTENT_TYPE,
+        )
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _presigned_redirect(field_file, filename):
+    # Signed with the S3 client rather than storage.url(): with a custom domain
+    # (R2_CUSTOM_DOMAIN) django-storages returns a plain, permanent public URL
+    storage = field_file.storage
+    url = storage.bucket.meta.client.generate_presigned_url(
+        'get_object',
+        Params={
+            'Bucket': storage.bucket_name,
+            'Key': posixpath.join(storage.location, field_file.name),
+            'ResponseContentDisposition': content_disposition_header(True, filename),
+        },
+        ExpiresIn=settings.BILL_DOWNLOAD_URL_EXPIRE,
+    )
+    return HttpResponseRedirect(url)
+
+
+def _requested_range(request, etag, size):
+    """
+    Return the (start, end) byte range to serve, None for the whole file or
+    False when the range cannot be satisfied. Multi-range requests and stale
+    If-Range validators fall back to the whole file.
+    """
+    header = request.META.get('HTTP_RANGE', '').strip()
+    if not header:
+        return None
+
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range.strip() != etag:
+        return None
+
+    match = RANGE_RE.match(header)
+    if not match or match.groups() == ('', ''):
+        return None
+
+    first, last = match.groups()
+    if first and last and int(last) < int(first):
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        return False
+    return start, end
+
+
+def _read_range(file, start, length):
+    try:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
@@ -0,0 +1,123 @@
+"""
+EUR to RON exchange rates from the BNR reference feed.
+
+Rates are persisted per day in ``ExchangeRate`` and served from a
+process-wide in-memory cache keyed by date, so views and admin pages never
+talk to BNR. The feed is only fetched by ``refresh_rates``, which runs daily
+from Celery beat after BNR publishes and from the ``refresh_exchange_rates``
+management command.
+"""
+import logging
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import date
+from decimal import Decimal
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ExchangeRate
+from .system_settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_DAYS = 64
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def parse_bnr_xml(content, currency='EUR'):
+    """Return (date, rate) tuples for ``currency`` from a BNR XML document"""
+    root = ET.fromstring(content)
+    rates = []
+    for cube in root.findall('.//{*}Cube'):
+        day = date.fromisoformat(cube.get('date'))
+        for node in cube.findall('{*}Rate'):
+            if node.get('currency') != currency:
+                continue
+            value = Decimal(node.text.strip())
+            multiplier = node.get('multiplier')
+            if multiplier:
+                value = value / Decimal(multiplier)
+            rates.append((day, value.quantize(Decimal('0.0001'))))
+    return rates
+
+
+def get_feed_url():
+    """Feed URL from SystemSettings, falling back to the public BNR feed"""
+    return get_setting('bnr_exchange_rate_url')
+
+
+def fetch_feed(url):
+    """Download the feed; ``file://`` URLs are read from disk for offline use"""
+    parsed = urlparse(url)
+    if parsed.scheme == 'file':
+        with open(url2pathname(parsed.path), 'rb') as feed:
+            return feed.read()
+
+    response = requests.get(url, timeout=settings.EXCHANGE_RATE_FETCH_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+def refresh_rates(url=None):
+    """Fetch the feed, store every published EUR rate and reset the cache"""
+    url = url or get_feed_url()
+    rates = parse_bnr_xml(fetch_feed(url))
+    for day, rate in rates:
+        ExchangeRate.objects.update_or_create(
+            date=day,
+            defaults={'rate': rate, 'source': url[:200]}
+        )
+    clear_cache()
+    return rates
+
+
+def get_rate(day=None):
+    """EUR to RON rate for ``day`` (default today), served from the cache"""
+    day = day or timezone.localdate()
+    now = time.monotonic()
+
+    cached = _cache.get(day)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    rate = _load_rate(day)
+    with _cache_lock:
+        _cache.pop(day, None)
+        _cache[day] = (rate, now + settings.EXCHANGE_RATE_CACHE_TTL)
+        if len(_cache) > MAX_CACHED_DAYS:
+            for key in [key for key, (_, expires) in _cache.items() if expires <= now]:
+                del _cache[key]
+            # Still full of live entries: drop the least recently loaded ones
+            for key in list(_cache)[:-MAX_CACHED_DAYS]:
+                del _cache[key]
+    return rate
+
+
+def eur_to_ron(amount, day=None):
+    """Convert an EUR amount to RON, rounded to bani"""
+    return (amount * get_rate(day)).quantize(Decimal('0.01'))
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _load_rate(day):
+    """Last known rate on or before ``day``, else the configured default"""
+    rate = ExchangeRate.objects.filter(
+        date__lte=day
+    ).order_by('-date').values_list('rate', flat=True).first()
+    if rate is not None:
+        return rate
+
+    default = get_setting('default_exchange_rate')
+    logger.warning('No exchange rate available for %s, using the default %s', day, default)
+    return default
@@ -0,0 +1,99 @@
+import re
+import threading
+import time
+from urllib.parse import urljoin
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from rent_app.benchmarking import add_baseline_arguments, handle_baseline, latency_summary
+
+DEFAULT_PATHS = ['/dashboard/', '/rent/', '/utilities/', '/meters/']
+CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test a running server as a logged-in tenant and report latency per page. '
+        'Run it against gunicorn (WSGI) and uvicorn with ASYNC_VIEWS=True (ASGI) to compare them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the running server')
+        parser.add_argument('--username', required=True, help='Tenant to log in as')
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--concurrency', type=int, default=10, help='Concurrent clients')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per page')
+        parser.add_argument('--path', action='append', dest='paths', help='Page to request (repeatable)')
+        add_baseline_arguments(parser)
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency and --requests must be at least 1')
+
+        cookies = _login(options['url'], options['username'], options['password'])
+        results = {}
+        for path in options['paths'] or DEFAULT_PATHS:
+            result = results[path] = _load(
+                urljoin(options['url'], path), cookies, options['concurrency'], options['requests']
+            )
+            self.stdout.write(
+                f"{path:<20} {result['throughput']:>7.1f} req/s  "
+                f"p50 {result['p50']:>7.1f}ms  p95 {result['p95']:>7.1f}ms  "
+                f"max {result['max']:>7.1f}ms  errors {result['errors']}"
+            )
+        handle_baseline(self, results, options, url=options['url'], concurrency=options['concurrency'])
+
+
+def _login(base_url, username, password):
+    session = requests.Session()
+    login_url = urljoin(base_url, '/')
+    match = CSRF_RE.search(session.get(login_url).text)
+    if not match:
+        raise CommandError(f'No login form at {login_url}')
+    response = session.post(
+        login_url,
+        data={'username': username, 'password': password, 'csrfmiddlewaretoken': match.group(1)},
+        headers={'Referer': login_url},
+        allow_redirects=False,
+    )
+    if response.status_code != 302 or 'sessionid' not in session.cookies:
+        raise CommandError(f'Could not log in as {username}')
+    return session.cookies.get_dict()
+
+
+def _load(url, cookies, concurrency, total):
+    timings, errors = [], []
+    remaining = iter(range(total))
+    lock = threading.Lock()
+
+    def client():
+        session = requests.Session()
+        session.cookies.update(cookies)
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            started = time.perf_counter()
+            try:
+                response = session.get(url, allow_redirects=False)
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                (timings if ok else errors).append(elapsed)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+
+    return {
+        'throughput': round(len(timings) / duration, 1),
+        **latency_summary(timings),
+        'errors': len(errors),
+    }
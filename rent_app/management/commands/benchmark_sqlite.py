@@ -0,0 +1,167 @@
+"""
+Concurrent reads and writes against a scratch SQLite file, once with Django's
+default settings and once with the ``SQLITE_TUNING`` profile.
+
+Everything goes through Django connections, the ``connection_created`` hook
+and ``transaction.atomic()``, like the app. Django 4.2 opens transactions with
+a deferred ``BEGIN``. A writer that reads first holds only a read snapshot.
+If another writer commits before it writes, SQLite can't upgrade the snapshot
+and fails with "database is locked" straight away, without waiting out the
+busy timeout. These failures are counted as locked writes. Django 5.1's
+``transaction_mode = 'IMMEDIATE'`` would avoid them.
+"""
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.db.backends.signals import connection_created
+
+from rent_app.sqlite_tuning import configure_connection
+
+ALIAS = 'sqlite_benchmark'
+TUNING_UID = 'rent_app_sqlite_tuning'
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent SQLite reads and writes with the default settings and the tuning profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5, help='Duration of each run')
+        parser.add_argument('--readers', type=int, default=4, help='Concurrent reader threads')
+        parser.add_argument('--writers', type=int, default=2, help='Concurrent writer threads')
+        parser.add_argument('--rows', type=int, default=50000, help='Rows in the benchmark table')
+
+    def handle(self, *args, **options):
+        if options['readers'] < 1 or options['writers'] < 1:
+            raise CommandError('--readers and --writers must be at least 1')
+
+        for label, tuned in (('default', False), ('tuned', True)):
+            with tempfile.TemporaryDirectory() as directory, _tuning(tuned), \
+                    _database(Path(directory) / 'benchmark.sqlite3'):
+                _create_table(options['rows'])
+                result = _run(options)
+            self.stdout.write(
+                f"{label:>8}: {result['reads']:>7} reads ({_ms(result['read_p50'])} p50, "
+                f"{_ms(result['read_p95'])} p95, {_ms(result['read_max'])} max), "
+                f"{result['writes']:>6} writes ({_ms(result['write_p95'])} p95), "
+                f"{result['read_errors']} locked read(s), {result['write_errors']} locked write(s)"
+            )
+
+
+@contextmanager
+def _tuning(enabled):
+    """Connect the app's ``connection_created`` hook or not, whatever SQLITE_TUNING says"""
+    was_connected = connection_created.disconnect(dispatch_uid=TUNING_UID)
+    if enabled:
+        connection_created.connect(configure_connection, dispatch_uid=TUNING_UID)
+    try:
+        yield
+    finally:
+        connection_created.disconnect(dispatch_uid=TUNING_UID)
+        if was_connected:
+            connection_created.connect(configure_connection, dispatch_uid=TUNING_UID)
+
+
+@contextmanager
+def _database(path):
+    configured = connections.configure_settings({
+        DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+        ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path), 'TIME_ZONE': settings.TIME_ZONE},
+    })
+    connections.settings[ALIAS] = configured[ALIAS]
+    try:
+        yield
+    finally:
+        connections[ALIAS].close()
+        del connections[ALIAS]
+        del connections.settings[ALIAS]
+
+
+def _create_table(rows):
+    with transaction.atomic(using=ALIAS), connections[ALIAS].cursor() as cursor:
+        cursor.execute('CREATE TABLE reading (id INTEGER PRIMARY KEY, tenant INTEGER, value REAL)')
+        cursor.execute('CREATE INDEX reading_tenant ON reading (tenant)')
+        cursor.executemany(
+            'INSERT INTO reading (tenant, value) VALUES (%s, %s)',
+            [(index % 100, index) for index in range(rows)],
+        )
+
+
+def _run(options):
+    deadline = time.monotonic() + options['seconds']
+    read_times, write_times = [], []
+    errors = {'read': 0, 'write': 0}
+    lock = threading.Lock()
+
+    def reader(number):
+        timings, failed = [], 0
+        with connections[ALIAS].cursor() as cursor:
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    cursor.execute('SELECT COUNT(*), SUM(value) FROM reading WHERE tenant = %s', [number % 100])
+                    cursor.fetchone()
+                except OperationalError:
+                    failed += 1
+                    continue
+                timings.append(time.perf_counter() - started)
+        connections[ALIAS].close()
+        with lock:
+            read_times.extend(timings)
+            errors['read'] += failed
+
+    def writer(number):
+        timings, failed = [], 0
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                # Read, then write, as the app's transactions do
+                with transaction.atomic(using=ALIAS), connections[ALIAS].cursor() as cursor:
+                    cursor.execute('SELECT COALESCE(MAX(value), 0) FROM reading WHERE tenant = %s', [number])
+                    last = cursor.fetchone()[0]
+                    cursor.executemany(
+                        'INSERT INTO reading (tenant, value) VALUES (%s, %s)',
+                        [(number, last + value) for value in range(1, 21)],
+                    )
+            except OperationalError:
+                failed += 1
+                continue
+            timings.append(time.perf_counter() - started)
+        connections[ALIAS].close()
+        with lock:
+            write_times.extend(timings)
+            errors['write'] += failed
+
+    threads = [threading.Thread(target=reader, args=(number,)) for number in range(options['readers'])]
+    threads += [threading.Thread(target=writer, args=(number,)) for number in range(options['writers'])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'reads': len(read_times),
+        'read_p50': _percentile(read_times, 50),
+        'read_p95': _percentile(read_times, 95),
+        'read_max': max(read_times, default=0),
+        'writes': len(write_times),
+        'write_p95': _percentile(write_times, 95),
+        'read_errors': errors['read'],
+        'write_errors': errors['write'],
+    }
+
+
+def _percentile(values, percent):
+    if len(values) < 2:
+        return values[0] if values else 0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+def _ms(seconds):
+    return f'{seconds * 1000:.1f}ms'
@@ -0,0 +1,109 @@
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rent_app.benchmarking import add_baseline_arguments, handle_baseline, latency_summary
+from rent_app.caching import invalidate_user_dashboard
+from rent_app.models import MeterType, Tenant
+from rent_app.reading_periods import get_calendar
+
+PAGES = ['dashboard', 'rent_status', 'utility_bills', 'meter_readings', 'submit_meter_reading']
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the tenant pages in-process with the test client and report latency, '
+        'queries per request and peak memory. Create data with generate_load_data first; '
+        'use benchmark_http for concurrent load against a running server.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', default='load0000', help='Tenant to request the pages as')
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per page')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per page first')
+        parser.add_argument('--cached', action='store_true',
+                            help='Serve the dashboard from its cache (default: rebuild it on every request)')
+        parser.add_argument('--page', action='append', dest='pages', choices=PAGES, help='Page to run (repeatable)')
+        add_baseline_arguments(parser)
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['warmup'] < 0:
+            raise CommandError('--requests must be at least 1 and --warmup not negative')
+        user = User.objects.filter(username=options['username']).first()
+        if user is None or not Tenant.objects.filter(user=user).exists():
+            raise CommandError(f"No tenant '{options['username']}'; run generate_load_data first")
+
+        client = Client()
+        client.force_login(user)
+        results = {}
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for page in options['pages'] or PAGES:
+                request = _page_request(client, page, user, options['cached'])
+                for _ in range(options['warmup']):
+                    request()
+                result = results[page] = _measure(request, options['requests'])
+                self.stdout.write(
+                    f"{page:<22} p50 {result['p50']:>7.1f}ms  p95 {result['p95']:>7.1f}ms  "
+                    f"queries {result['queries']:>3}  peak {result['peak_kib']:>7.0f} KiB"
+                )
+        handle_baseline(self, results, options, username=options['username'], requests=options['requests'])
+
+
+def _page_request(client, page, user, cached):
+    """A callable making one request to ``page`` and returning the response"""
+    url = reverse(f'rent_app:{page}')
+    if page == 'submit_meter_reading':
+        open_types = get_calendar().open_meter_types()
+        meter_type = MeterType.objects.filter(is_active=True, pk__in=open_types).first()
+        if meter_type is None:
+            raise CommandError('No reading period is open today, so submit_meter_reading has nothing to measure')
+        data = {'meter_type': meter_type.pk, 'reading_value': '999999.99'}
+
+        def submit():
+            # Rolled back, so every request inserts the same reading and nothing is notified
+            with transaction.atomic():
+                response = client.post(url, data)
+                transaction.set_rollback(True)
+            return response
+        return _expect(submit, 302)
+
+    def get():
+        if page == 'dashboard' and not cached:
+            invalidate_user_dashboard(user.pk)
+        return client.get(url)
+    return _expect(get, 200)
+
+
+def _expect(request, status):
+    def checked():
+        response = request()
+        if response.status_code != status:
+            raise CommandError(f'{response.request["PATH_INFO"]} returned {response.status_code}, expected {status}')
+        return response
+    return checked
+
+
+def _measure(request, count):
+    timings, queries = [], 0
+    for _ in range(count):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            request()
+            timings.append(time.perf_counter() - started)
+        queries = max(queries, len(captured))
+
+    # Measured apart from the timings, since tracing allocations slows everything down
+    tracemalloc.start()
+    try:
+        request()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {**latency_summary(timings), 'queries': queries, 'peak_kib': round(peak / 1024, 1)}
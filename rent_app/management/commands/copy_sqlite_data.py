@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+SOURCE_ALIAS = 'sqlite_source'
+# Filled in by migrate on the target, replaced with the source rows
+MIGRATE_CREATED = (Permission, ContentType)
+
+
+class Command(BaseCommand):
+    help = 'Copy all data from a SQLite database into the configured (e.g. PostgreSQL) database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            default=str(settings.BASE_DIR / 'data' / 'db.sqlite3'),
+            help='SQLite database file to copy from (default: data/db.sqlite3)'
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Target database alias')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        source_path = Path(options['source'])
+        if not source_path.exists():
+            raise CommandError(f'{source_path} does not exist')
+        target = options['database']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        _add_source_database(source_path)
+        if connections[SOURCE_ALIAS].settings_dict['NAME'] == connections[target].settings_dict['NAME']:
+            raise CommandError('Source and target are the same database')
+
+        models = _copied_models()
+        not_empty = [
+            model._meta.label for model in models
+            if model not in MIGRATE_CREATED and model._base_manager.using(target).exists()
+        ]
+        if not_empty:
+            raise CommandError(
+                f'The target database already has data ({", ".join(not_empty)}); '
+                'copy into a freshly migrated database'
+            )
+
+        connection = connections[target]
+        with transaction.atomic(using=target), connection.constraint_checks_disabled():
+            for model in MIGRATE_CREATED:
+                model._base_manager.using(target).all().delete()
+            for model in models:
+                copied = _copy_model(model, target, batch_size)
+                if copied:
+                    self.stdout.write(f'{model._meta.label}: {copied} row(s)')
+            # PostgreSQL checks its deferred constraints on commit; SQLite needs an explicit check
+            connection.check_constraints()
+
+        with connection.cursor() as cursor:
+            for statement in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(statement)
+        ContentType.objects.clear_cache()
+        self.stdout.write(self.style.SUCCESS(f'Copied {source_path} into the "{target}" database'))
+
+
+def _add_source_database(path):
+    configured = connections.configure_settings({
+        DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+        SOURCE_ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path)},
+    })
+    connections.settings[SOURCE_ALIAS] = configured[SOURCE_ALIAS]
+
+
+def _copied_models():
+    return [
+        model for model in apps.get_models(include_auto_created=True)
+        if model._meta.managed and not model._meta.proxy
+    ]
+
+
+def _copy_model(model, target, batch_size):
+    """Copy the rows of ``model`` in primary key order, keeping keys and timestamps"""
+    copied = 0
+    batch = []
+    with _keep_timestamps(model):
+        for obj in model._base_manager.using(SOURCE_ALIAS).order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                model._base_manager.using(target).bulk_create(batch)
+                copied += len(batch)
+                batch = []
+        model._base_manager.using(target).bulk_create(batch)
+    return copied + len(batch)
+
+
+@contextmanager
+def _keep_timestamps(model):
+    """Turn off auto_now/auto_now_add so bulk_create doesn't overwrite copied values"""
+    fields = [field for field in model._meta.concrete_fields if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
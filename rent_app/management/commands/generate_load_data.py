@@ -0,0 +1,185 @@
+import random
+import re
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from rent_app.analytics import monthly_rows
+from rent_app.dates import add_months, clamp_day, month_range
+from rent_app.exchange_rates import get_rate
+from rent_app.models import (
+    MeterReading, MeterType, RentAgreement, RentPayment, Tenant, UtilityBill, UtilityType
+)
+from rent_app.rent_payments import get_due_day
+
+BATCH_SIZE = 1000
+# Typical monthly consumption per meter type name; others use the default
+CONSUMPTION = {'Electricity': (80, 300), 'Gas': (10, 150), 'Water': (2, 12)}
+DEFAULT_CONSUMPTION = (5, 50)
+BILL_AMOUNTS = {'Electricity': (80, 400), 'Gas': (40, 600), 'Water': (30, 120), 'Internet': (50, 60)}
+DEFAULT_BILL_AMOUNT = (100, 300)
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-create tenants with years of rent payments, utility bills and meter readings '
+        'for load testing. Run setup_initial_data first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenants', type=int, default=100, help='Tenants to create')
+        parser.add_argument('--years', type=int, default=3, help='Years of history per tenant')
+        parser.add_argument('--prefix', default='load', help='Username prefix of the generated tenants')
+        parser.add_argument('--password', default='load-pass', help='Password of every generated tenant')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for repeatable data')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete previously generated tenants with the same prefix first')
+
+    def handle(self, *args, **options):
+        if options['tenants'] < 1 or options['years'] < 1:
+            raise CommandError('--tenants and --years must be at least 1')
+        utility_types = list(UtilityType.objects.filter(is_active=True))
+        meter_types = list(MeterType.objects.filter(is_active=True))
+        if not utility_types or not meter_types:
+            raise CommandError('No utility or meter types; run setup_initial_data first')
+
+        existing = _generated_users(options['prefix'])
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(
+                    f"Tenants generated with the prefix '{options['prefix']}' exist; pass --clear to replace them"
+                )
+            with transaction.atomic():
+                existing.delete()
+
+        started = time.monotonic()
+        with transaction.atomic():
+            counts = _generate(options, utility_types, meter_types)
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f'{count} {name}' for name, count in counts.items())
+            + f' created in {time.monotonic() - started:.1f}s'
+        ))
+
+
+def _generated_users(prefix):
+    """Users named like the generated tenants: the prefix followed only by digits"""
+    return User.objects.filter(username__regex=rf'^{re.escape(prefix)}[0-9]+$')
+
+
+class _Writer:
+    """Buffers new rows per model and inserts them with ``bulk_create`` in batches"""
+
+    def __init__(self):
+        self.pending = {}
+        self.counts = {}
+
+    def add(self, obj):
+        model = type(obj)
+        batch = self.pending.setdefault(model, [])
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            self.flush(model)
+
+    def flush(self, model=None):
+        for model in [model] if model else list(self.pending):
+            batch = self.pending.pop(model, [])
+            model.objects.bulk_create(batch)
+            name = str(model._meta.verbose_name_plural).lower()
+            self.counts[name] = self.counts.get(name, 0) + len(batch)
+
+
+def _generate(options, utility_types, meter_types):
+    rng = random.Random(options['seed'])
+    today = timezone.localdate()
+    current_month = today.replace(day=1)
+    months = list(month_range(add_months(current_month, -12 * options['years']), current_month))
+    due_day = get_due_day()
+    rates = {month: get_rate(clamp_day(month, due_day)) for month in months}
+    writer = _Writer()
+
+    # Hashing is slow by design, so every tenant shares one hash
+    password = make_password(options['password'])
+    names = [f"{options['prefix']}{number:04d}" for number in range(options['tenants'])]
+    for name in names:
+        writer.add(User(username=name, password=password, first_name='Load', last_name=name))
+    writer.flush()
+    # None of these existed before (checked by the command), and it avoids huge IN lists
+    users = _generated_users(options['prefix']).values_list('id', flat=True)
+    for user_id in users:
+        writer.add(Tenant(user_id=user_id, phone='0700000000', address='Generated for load testing'))
+    writer.flush()
+    tenants = list(Tenant.objects.filter(user_id__in=users).values_list('id', flat=True))
+
+    for tenant_id in tenants:
+        writer.add(RentAgreement(
+            tenant_id=tenant_id,
+            monthly_rent_eur=Decimal(rng.randrange(300, 900, 10)),
+            start_date=months[0],
+        ))
+    writer.flush()
+    agreements = RentAgreement.objects.filter(tenant_id__in=tenants).values_list('id', 'monthly_rent_eur')
+
+    for agreement_id, rent_eur in agreements:
+        for month in months:
+            due_date = clamp_day(month, due_day)
+            paid = due_date < today - timedelta(days=10) and rng.random() > 0.02
+            writer.add(RentPayment(
+                agreement_id=agreement_id,
+                amount_eur=rent_eur,
+                amount_ron=(rent_eur * rates[month]).quantize(Decimal('0.01')),
+                exchange_rate=rates[month],
+                due_date=due_date,
+                payment_date=due_date + timedelta(days=rng.randint(0, 5)) if paid else None,
+                status='paid' if paid else 'overdue' if due_date < today else 'pending',
+            ))
+
+    series = []
+    for tenant_id in tenants:
+        for utility_type in utility_types:
+            low, high = BILL_AMOUNTS.get(utility_type.name, DEFAULT_BILL_AMOUNT)
+            for month in months:
+                due_date = month + timedelta(days=19)
+                paid = due_date < today - timedelta(days=30) and rng.random() > 0.02
+                writer.add(UtilityBill(
+                    utility_type=utility_type,
+                    tenant_id=tenant_id,
+                    amount=Decimal(rng.randint(low * 100, high * 100)).scaleb(-2),
+                    bill_date=month,
+                    due_date=due_date,
+                    paid_on=due_date - timedelta(days=rng.randint(0, 10)) if paid else None,
+                    status='paid' if paid else 'overdue' if due_date < today else 'unpaid',
+                ))
+
+        for meter_type in meter_types:
+            low, high = CONSUMPTION.get(meter_type.name, DEFAULT_CONSUMPTION)
+            value = Decimal(rng.randint(0, 5000))
+            previous = None
+            for month in months:
+                # The last day of the reading period, so every reading is in a valid period
+                reading_date = clamp_day(month, meter_type.reading_day_end)
+                if reading_date > today:
+                    break
+                value += Decimal(rng.randint(low * 100, high * 100)).scaleb(-2)
+                writer.add(MeterReading(
+                    meter_type=meter_type,
+                    tenant_id=tenant_id,
+                    reading_value=value,
+                    reading_date=reading_date,
+                    is_processed=reading_date < current_month,
+                ))
+                series.append((tenant_id, meter_type.id, reading_date, None if previous is None else value - previous))
+                previous = value
+
+        # Monthly consumption is derived from the series above rather than recomputed from the table
+        for row in monthly_rows(series):
+            writer.add(row)
+        series.clear()
+
+    writer.flush()
+    return writer.counts
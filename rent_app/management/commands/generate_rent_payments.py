@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rent_app.rent_payments import generate_rent_payments
+
+
+class Command(BaseCommand):
+    help = 'Create monthly rent payments for all active rent agreements'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--month',
+            help='Month (YYYY-MM) or backfill range (YYYY-MM:YYYY-MM); defaults to the current month'
+        )
+
+    def handle(self, *args, **options):
+        first_month = last_month = None
+        if options['month']:
+            first, _, last = options['month'].partition(':')
+            first_month = self._parse_month(first)
+            last_month = self._parse_month(last) if last else first_month
+            if last_month < first_month:
+                raise CommandError('The end of the --month range is before its start.')
+
+        created = generate_rent_payments(first_month, last_month)
+        self.stdout.write(self.style.SUCCESS(f'Created {created} rent payment(s)'))
+
+    def _parse_month(self, value):
+        try:
+            return datetime.strptime(value.strip(), '%Y-%m').date()
+        except ValueError:
+            raise CommandError(f'Invalid month "{value}", expected YYYY-MM.')
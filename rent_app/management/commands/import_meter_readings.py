@@ -0,0 +1,38 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rent_app.reading_import import detect_format, import_readings, parse_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk import meter readings from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV/JSON file to import, or - for standard input')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json'],
+            help='Input format; detected from the file extension by default'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        try:
+            if path == '-':
+                report = import_readings(parse_rows(sys.stdin, fmt))
+            else:
+                with open(path, encoding='utf-8-sig', newline='') as stream:
+                    report = import_readings(parse_rows(stream, fmt))
+        except OSError as exc:
+            raise CommandError(exc)
+        except (ValueError, csv.Error) as exc:
+            raise CommandError(f'Could not parse {fmt.upper()} input, nothing was imported: {exc}')
+
+        for error in report.as_dict()['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {report.created} reading(s), rejected {report.rejected}'
+        ))
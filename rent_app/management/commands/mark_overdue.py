@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from rent_app.overdue import DEFAULT_BATCH_SIZE, reconcile_overdue
+
+
+class Command(BaseCommand):
+    help = 'Mark past-due unpaid bills and pending rent payments as overdue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Rows updated per transaction'
+        )
+
+    def handle(self, *args, **options):
+        result = reconcile_overdue(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Marked {result['bills']} bill(s) and {result['payments']} rent payment(s) overdue "
+            f"in {result['seconds']}s"
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from rent_app.analytics import rebuild_monthly_consumption
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly consumption table from all meter readings'
+
+    def handle(self, *args, **options):
+        created = rebuild_monthly_consumption()
+        self.stdout.write(self.style.SUCCESS(f'Stored {created} monthly consumption row(s)'))
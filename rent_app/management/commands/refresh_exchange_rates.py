@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from rent_app.exchange_rates import refresh_rates
+
+
+class Command(BaseCommand):
+    help = 'Fetch EUR/RON rates from the BNR XML feed and store them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            help='Feed URL to use instead of the bnr_exchange_rate_url setting (file:// URLs are supported)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and refresh every INTERVAL seconds'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                rates = refresh_rates(options['url'])
+            except Exception as exc:
+                # Keep the last known rate; views fall back to it
+                self.stderr.write(f'Exchange rate refresh failed: {exc}')
+            else:
+                for day, rate in rates:
+                    self.stdout.write(f'EUR/RON {rate} on {day}')
+                self.stdout.write(self.style.SUCCESS(f'Stored {len(rates)} exchange rate(s)'))
+
+            if not options['interval']:
+                break
+            close_old_connections()
+            time.sleep(options['interval'])
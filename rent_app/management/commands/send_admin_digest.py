@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from rent_app.notifications import flush_admin_digest
+
+
+class Command(BaseCommand):
+    help = 'Send buffered admin notifications as a digest email'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Send pending notifications even if the batch window has not elapsed'
+        )
+
+    def handle(self, *args, **options):
+        sent = flush_admin_digest(force=options['force'])
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} notification(s)'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from rent_app.reminders import send_reading_reminders
+
+
+class Command(BaseCommand):
+    help = 'Email tenants who have not submitted readings for periods closing soon'
+
+    def handle(self, *args, **options):
+        sent = send_reading_reminders()
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} reminder(s)'))
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from rent_app.models import UtilityType, MeterType, SystemSettings
+from rent_app.system_settings import SETTINGS
 
 
 class Command(BaseCommand):
@@ -59,23 +60,10 @@ class Command(BaseCommand):
             else:
                 self.stdout.write(f'Meter type already exists: {meter_type.name}')
 
-        # Create system settings
+        # Create system settings with their declared defaults
         system_settings = [
-            {
-                'key': 'bnr_exchange_rate_url',
-                'value': 'https://www.bnr.ro/nbrfxrates.xml',
-                'description': 'BNR XML feed URL for exchange rates'
-            },
-            {
-                'key': 'default_exchange_rate',
-                'value': '5.00',
-                'description': 'Default EUR to RON exchange rate when BNR is unavailable'
-            },
-            {
-                'key': 'meter_reading_notification_days',
-                'value': '3',
-                'description': 'Days before reading period ends to send notification'
-            },
+            {'key': setting.key, 'value': str(setting.default), 'description': setting.description}
+            for setting in SETTINGS.values()
         ]
 
         for setting_data in system_settings:
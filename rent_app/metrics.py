@@ -0,0 +1,210 @@
+"""
+Request performance metrics, enabled with ``PERF_METRICS``.
+
+``rent_app.middleware.PerformanceMiddleware`` opens a ``RequestMetrics`` for
+every request in a context variable; SQL queries (through an execute wrapper
+installed on every new connection) and template renders (through
+``rent_app.templating.TimedDjangoTemplates``) add to it, including those run
+from worker threads by the async views. Totals are aggregated per view in
+the process and published to the shared cache every
+``PERF_METRICS_PUBLISH_INTERVAL`` seconds, so the Prometheus endpoint can add
+up all gunicorn workers. When the setting is off none of this is installed.
+"""
+import os
+import socket
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Upper bounds in seconds of the request duration histogram
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+WORKERS_KEY = 'rent_app:perf:workers'
+WORKER_KEY = 'rent_app:perf:worker:{worker}'
+
+_current = ContextVar('rent_app_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Counters of one request; may be updated from several threads"""
+    __slots__ = ('started', 'queries', 'sql_time', 'template_time', '_lock')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self._lock = threading.Lock()
+
+    def add_query(self, duration):
+        with self._lock:
+            self.queries += 1
+            self.sql_time += duration
+
+    def add_template(self, duration):
+        with self._lock:
+            self.template_time += duration
+
+
+def begin_request():
+    """Start collecting for the current context; returns (token, metrics)"""
+    metrics = RequestMetrics()
+    return _current.set(metrics), metrics
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current_request():
+    return _current.get()
+
+
+def sql_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` that times queries of instrumented requests"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(time.perf_counter() - started)
+
+
+def install_sql_wrapper(sender, connection, **kwargs):
+    """``connection_created`` receiver"""
+    connection.execute_wrappers.append(sql_wrapper)
+
+
+class MetricsRegistry:
+    """Per-view totals of this process"""
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+        self._published_at = 0.0
+
+    @property
+    def worker(self):
+        # Looked up on use: with gunicorn's preload_app the module is imported before forking
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    def record(self, view, duration, metrics, size):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = _empty_stats()
+            stats['requests'] += 1
+            stats['duration'] += duration
+            stats['queries'] += metrics.queries
+            stats['sql_time'] += metrics.sql_time
+            stats['template_time'] += metrics.template_time
+            stats['bytes'] += size
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    stats['buckets'][index] += 1
+                    break
+
+    def publish_due(self):
+        """Whether ``PERF_METRICS_PUBLISH_INTERVAL`` elapsed; claims the publish when it did"""
+        now = time.monotonic()
+        if now - self._published_at <= settings.PERF_METRICS_PUBLISH_INTERVAL:
+            return False
+        self._published_at = now
+        return True
+
+    def snapshot(self):
+        with self._lock:
+            return {view: dict(stats, buckets=list(stats['buckets'])) for view, stats in self._views.items()}
+
+    def publish(self):
+        """Store this process's totals in the shared cache for the metrics endpoint"""
+        timeout = settings.PERF_METRICS_PUBLISH_INTERVAL * 20
+        cache.set(WORKER_KEY.format(worker=self.worker), self.snapshot(), timeout)
+        workers = cache.get(WORKERS_KEY) or []
+        if self.worker not in workers:
+            cache.set(WORKERS_KEY, workers + [self.worker], None)
+
+    def collect(self):
+        """Totals of all workers that published recently, with this process's live ones"""
+        others = [worker for worker in cache.get(WORKERS_KEY) or [] if worker != self.worker]
+        published = cache.get_many([WORKER_KEY.format(worker=worker) for worker in others])
+        alive = [worker for worker in others if WORKER_KEY.format(worker=worker) in published]
+        if len(alive) != len(others):
+            # Forget workers whose snapshot expired (e.g. recycled after max-requests)
+            cache.set(WORKERS_KEY, alive + [self.worker], None)
+        return merge_snapshots([self.snapshot(), *published.values()])
+
+
+def merge_snapshots(snapshots):
+    merged = {}
+    for snapshot in snapshots:
+        for view, stats in snapshot.items():
+            total = merged.setdefault(view, _empty_stats())
+            for key in ('requests', 'duration', 'queries', 'sql_time', 'template_time', 'bytes'):
+                total[key] += stats[key]
+            total['buckets'] = [a + b for a, b in zip(total['buckets'], stats['buckets'])]
+    return merged
+
+
+def render_prometheus(stats):
+    """Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+
+    def metric(name, kind, description, samples):
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(samples)
+
+    views = sorted(stats)
+    for name, key, description in (
+        ('rentmanager_requests_total', 'requests', 'Requests served'),
+        ('rentmanager_db_queries_total', 'queries', 'SQL queries run'),
+        ('rentmanager_db_duration_seconds_total', 'sql_time', 'Time spent in SQL queries'),
+        ('rentmanager_template_duration_seconds_total', 'template_time', 'Time spent rendering templates'),
+        ('rentmanager_response_bytes_total', 'bytes', 'Response body bytes (streamed bodies without length excluded)'),
+    ):
+        metric(name, 'counter', description, [
+            f'{name}{{view="{_label(view)}"}} {_number(stats[view][key])}' for view in views
+        ])
+
+    samples = []
+    for view in views:
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, stats[view]['buckets']):
+            cumulative += count
+            samples.append(f'rentmanager_request_duration_seconds_bucket{{view="{_label(view)}",le="{bound}"}} {cumulative}')
+        samples.append(
+            f'rentmanager_request_duration_seconds_bucket{{view="{_label(view)}",le="+Inf"}} {stats[view]["requests"]}'
+        )
+        samples.append(f'rentmanager_request_duration_seconds_sum{{view="{_label(view)}"}} {_number(stats[view]["duration"])}')
+        samples.append(f'rentmanager_request_duration_seconds_count{{view="{_label(view)}"}} {stats[view]["requests"]}')
+    metric('rentmanager_request_duration_seconds', 'histogram', 'Request wall time', samples)
+    return '\n'.join(lines) + '\n'
+
+
+def _empty_stats():
+    return {
+        'requests': 0,
+        'duration': 0.0,
+        'queries': 0,
+        'sql_time': 0.0,
+        'template_time': 0.0,
+        'bytes': 0,
+        'buckets': [0] * len(DURATION_BUCKETS),
+    }
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return f'{value:.6f}' if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,75 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from .metrics import begin_request, end_request, registry
+
+logger = logging.getLogger('rent_app.performance')
+
+
+class PerformanceMiddleware:
+    """
+    Time every request and add a ``Server-Timing`` header; see ``rent_app.metrics``.
+    Only installed when ``PERF_METRICS`` is on.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token, metrics = begin_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        response = self._finish(request, response, metrics)
+        if registry.publish_due():
+            registry.publish()
+        return response
+
+    async def __acall__(self, request):
+        token, metrics = begin_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        response = self._finish(request, response, metrics)
+        if registry.publish_due():
+            # The cache backend may do network I/O, keep it off the event loop
+            await sync_to_async(registry.publish)()
+        return response
+
+    def _finish(self, request, response, metrics):
+        duration = time.perf_counter() - metrics.started
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        registry.record(view, duration, metrics, _response_size(response))
+
+        response['Server-Timing'] = (
+            f'total;dur={duration * 1000:.1f}, '
+            f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.queries} queries", '
+            f'tpl;dur={metrics.template_time * 1000:.1f}'
+        )
+        if duration * 1000 >= settings.PERF_SLOW_REQUEST_MS:
+            logger.warning(
+                'Slow request: %s %s (%s) took %.0fms, %d queries in %.0fms, templates %.0fms',
+                request.method, request.path, view, duration * 1000,
+                metrics.queries, metrics.sql_time * 1000, metrics.template_time * 1000,
+            )
+        return response
+
+
+def _response_size(response):
+    if response.streaming:
+        # Streamed bodies aren't consumed here; count them when the length is known
+        return int(response.get('Content-Length') or 0)
+    return len(response.content)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent_app', '0004_exchangerate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meterreading',
+            index=models.Index(fields=['tenant', 'meter_type', '-reading_date'], name='meterreading_latest_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent_app', '0006_notificationevent'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='rentpayment',
+            constraint=models.UniqueConstraint(fields=('agreement', 'due_date'), name='unique_rent_payment_per_due_date'),
+        ),
+    ]
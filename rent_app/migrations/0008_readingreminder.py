@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent_app', '0007_unique_rent_payment_per_due_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadingReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_closes', models.DateField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('meter_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='rent_app.metertype')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='rent_app.tenant')),
+            ],
+            options={
+                'verbose_name': 'Reading Reminder',
+                'verbose_name_plural': 'Reading Reminders',
+                'ordering': ['-sent_at'],
+                'unique_together': {('tenant', 'meter_type', 'period_closes')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent_app', '0008_readingreminder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyConsumption',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('consumption', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('reading_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('meter_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='rent_app.metertype')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='rent_app.tenant')),
+            ],
+            options={
+                'verbose_name': 'Monthly Consumption',
+                'verbose_name_plural': 'Monthly Consumption',
+                'ordering': ['tenant', 'meter_type', 'month'],
+                'unique_together': {('tenant', 'meter_type', 'month')},
+            },
+        ),
+    ]
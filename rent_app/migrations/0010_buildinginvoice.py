@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:10
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent_app', '0009_monthlyconsumption'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BuildingInvoice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12, validators=[django.core.validators.MinValueValidator(0)])),
+                ('period_start', models.DateField(help_text='First day of the billed consumption period')),
+                ('period_end', models.DateField(help_text='Last day of the billed consumption period')),
+                ('due_date', models.DateField()),
+                ('bill_date', models.DateField(default=django.utils.timezone.now)),
+                ('split_method', models.CharField(choices=[('auto', 'Automatic (by consumption when a matching meter exists)'), ('consumption', 'By consumption'), ('equal', 'Equal shares')], default='auto', max_length=20)),
+                ('invoice_number', models.CharField(blank=True, help_text='Optional invoice number', max_length=100)),
+                ('bill_file', models.FileField(blank=True, null=True, upload_to='building_invoices/')),
+                ('is_split', models.BooleanField(default=False)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Building Invoice',
+                'verbose_name_plural': 'Building Invoices',
+                'ordering': ['-period_end'],
+            },
+        ),
+        migrations.AddField(
+            model_name='buildinginvoice',
+            name='utility_type',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='rent_app.utilitytype'),
+        ),
+        migrations.AddField(
+            model_name='utilitybill',
+            name='building_invoice',
+            field=models.ForeignKey(blank=True, help_text='Building invoice this bill was split from', null=True, on_delete=django.db.models.deletion.SET_NULL, to='rent_app.buildinginvoice'),
+        ),
+        migrations.AddConstraint(
+            model_name='utilitybill',
+            constraint=models.UniqueConstraint(fields=('building_invoice', 'tenant'), name='unique_bill_per_building_invoice'),
+        ),
+    ]
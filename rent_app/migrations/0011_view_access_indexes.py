@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent_app', '0010_buildinginvoice'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meterreading',
+            index=models.Index(fields=['tenant', '-reading_date'], name='meterreading_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rentpayment',
+            index=models.Index(fields=['status', 'due_date'], name='rentpayment_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='utilitybill',
+            index=models.Index(fields=['tenant', 'status', 'due_date'], name='utilitybill_tenant_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='utilitybill',
+            index=models.Index(fields=['status', 'due_date'], name='utilitybill_status_due_idx'),
+        ),
+    ]
@@ -36,10 +36,9 @@ class RentAgreement(models.Model):
 
     @property
     def monthly_rent_ron(self):
-        """Convert EUR to RON using current BNR rate"""
-        # For now, return EUR * 5 as a placeholder
-        # TODO: Implement actual BNR API integration
-        return self.monthly_rent_eur * 5
+        """Convert EUR to RON using the cached BNR rate"""
+        from .exchange_rates import eur_to_ron
+        return eur_to_ron(self.monthly_rent_eur)
 
 
 class RentPayment(models.Model):
@@ -78,6 +77,13 @@ class RentPayment(models.Model):
 
     class Meta:
         ordering = ['-due_date']
+        constraints = [
+            models.UniqueConstraint(fields=['agreement', 'due_date'], name='unique_rent_payment_per_due_date'),
+        ]
+        # Per-agreement lookups and history pages use the unique constraint's index
+        indexes = [
+            models.Index(fields=['status', 'due_date'], name='rentpayment_status_due_idx'),
+        ]
 
 
 class UtilityType(models.Model):
@@ -117,6 +123,13 @@ class UtilityBill(models.Model):
     bill_file = models.FileField(upload_to='utility_bills/', blank=True, null=True)
     invoice_number = models.CharField(max_length=100, blank=True, help_text="Optional invoice number")
     paid_on = models.DateField(null=True, blank=True, help_text="Date when the bill was paid")
+    building_invoice = models.ForeignKey(
+        'BuildingInvoice',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        help_text="Building invoice this bill was split from"
+    )
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -126,6 +139,13 @@ class UtilityBill(models.Model):
 
     class Meta:
         ordering = ['-due_date']
+        constraints = [
+            models.UniqueConstraint(fields=['building_invoice', 'tenant'], name='unique_bill_per_building_invoice'),
+        ]
+        indexes = [
+            models.Index(fields=['tenant', 'status', 'due_date'], name='utilitybill_tenant_status_idx'),
+            models.Index(fields=['status', 'due_date'], name='utilitybill_status_due_idx'),
+        ]
 
 
 class MeterType(models.Model):
@@ -171,6 +191,10 @@ class MeterReading(models.Model):
     class Meta:
         ordering = ['-reading_date']
         unique_together = ['meter_type', 'tenant', 'reading_date']
+        indexes = [
+            models.Index(fields=['tenant', 'meter_type', '-reading_date'], name='meterreading_latest_idx'),
+            models.Index(fields=['tenant', '-reading_date'], name='meterreading_recent_idx'),
+        ]
 
 
 class SystemSettings(models.Model):
@@ -186,3 +210,112 @@ class SystemSettings(models.Model):
     class Meta:
         verbose_name = "System Setting"
         verbose_name_plural = "System Settings"
+
+
+class ExchangeRate(models.Model):
+    """Daily EUR to RON reference rate published by BNR"""
+    date = models.DateField(unique=True)
+    rate = models.DecimalField(
+        max_digits=6,
+        decimal_places=4,
+        validators=[MinValueValidator(0)]
+    )
+    source = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"EUR/RON {self.rate} - {self.date}"
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name = "Exchange Rate"
+        verbose_name_plural = "Exchange Rates"
+
+
+class NotificationEvent(models.Model):
+    """Admin notification buffered for the next digest email"""
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    batch = models.CharField(max_length=32, blank=True, db_index=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.subject} - {self.created_at}"
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "Notification Event"
+        verbose_name_plural = "Notification Events"
+
+
+class ReadingReminder(models.Model):
+    """Log of meter reading reminders sent, one per tenant, meter and period"""
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    meter_type = models.ForeignKey(MeterType, on_delete=models.CASCADE)
+    period_closes = models.DateField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.meter_type.name} reminder for {self.tenant} - {self.period_closes}"
+
+    class Meta:
+        ordering = ['-sent_at']
+        unique_together = ['tenant', 'meter_type', 'period_closes']
+        verbose_name = "Reading Reminder"
+        verbose_name_plural = "Reading Reminders"
+
+
+class MonthlyConsumption(models.Model):
+    """Consumption per tenant, meter and month, derived from MeterReading deltas"""
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    meter_type = models.ForeignKey(MeterType, on_delete=models.CASCADE)
+    month = models.DateField(help_text="First day of the month")
+    consumption = models.DecimalField(max_digits=12, decimal_places=2)
+    reading_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.meter_type.name}: {self.consumption} {self.meter_type.unit} - {self.month:%Y-%m}"
+
+    class Meta:
+        ordering = ['tenant', 'meter_type', 'month']
+        unique_together = ['tenant', 'meter_type', 'month']
+        verbose_name = "Monthly Consumption"
+        verbose_name_plural = "Monthly Consumption"
+
+
+class BuildingInvoice(models.Model):
+    """Supplier invoice for the whole building, split into tenant utility bills"""
+    SPLIT_CHOICES = [
+        ('auto', 'Automatic (by consumption when a matching meter exists)'),
+        ('consumption', 'By consumption'),
+        ('equal', 'Equal shares'),
+    ]
+
+    utility_type = models.ForeignKey(UtilityType, on_delete=models.CASCADE)
+    amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        validators=[MinValueValidator(0)]
+    )
+    period_start = models.DateField(help_text="First day of the billed consumption period")
+    period_end = models.DateField(help_text="Last day of the billed consumption period")
+    due_date = models.DateField()
+    bill_date = models.DateField(default=timezone.now)
+    split_method = models.CharField(max_length=20, choices=SPLIT_CHOICES, default='auto')
+    invoice_number = models.CharField(max_length=100, blank=True, help_text="Optional invoice number")
+    bill_file = models.FileField(upload_to='building_invoices/', blank=True, null=True)
+    is_split = models.BooleanField(default=False)
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.utility_type.name} - {self.amount} RON - {self.period_start} to {self.period_end}"
+
+    class Meta:
+        ordering = ['-period_end']
+        verbose_name = "Building Invoice"
+        verbose_name_plural = "Building Invoices"
@@ -0,0 +1,127 @@
+"""
+Email notifications, delivered asynchronously through the Celery queue.
+
+Views only enqueue jobs; the ``send_email`` task talks to SMTP from the
+worker. With ``CELERY_TASK_ALWAYS_EAGER`` the task runs in-process, which
+together with the locmem email backend keeps everything testable offline.
+
+When the ``admin_notification_mode`` setting is ``digest``, admin
+notifications are buffered as ``NotificationEvent`` rows instead and sent
+by ``flush_admin_digest`` as consolidated emails over one SMTP connection.
+"""
+import logging
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from . import tasks
+from .models import NotificationEvent
+from .system_settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADMIN_EMAIL = 'admin@rentmanager.palko.app'
+
+
+def admin_recipients():
+    return [settings.ADMINS[0][1] if settings.ADMINS else DEFAULT_ADMIN_EMAIL]
+
+
+def enqueue_email(subject, message, recipient_list):
+    """Queue an email once the current transaction commits"""
+    transaction.on_commit(lambda: _enqueue(tasks.send_email, subject, message, recipient_list))
+
+
+def notify_admins(subject, message):
+    """Email the admins now, or buffer the event when digest mode is on"""
+    config = digest_config()
+    if not config['enabled']:
+        enqueue_email(subject, message, admin_recipients())
+        return
+
+    NotificationEvent.objects.create(subject=subject, message=message)
+    pending = NotificationEvent.objects.filter(batch='').count()
+    if pending >= config['max_events']:
+        # Size limit reached, don't wait for the next scheduled flush
+        transaction.on_commit(lambda: _enqueue(tasks.flush_admin_digest))
+
+
+def digest_config():
+    """Digest mode and its limits from SystemSettings"""
+    return {
+        'enabled': get_setting('admin_notification_mode') == 'digest',
+        'window': timedelta(minutes=get_setting('admin_digest_window_minutes')),
+        'max_events': get_setting('admin_digest_max_events'),
+    }
+
+
+def flush_admin_digest(force=False):
+    """
+    Send buffered admin notifications once the oldest one is older than the
+    batch window or the buffer reached its size limit. Every email holds at
+    most ``max_events`` events and all of them share one SMTP connection.
+    Returns the number of events sent.
+    """
+    prune_sent_events()
+    config = digest_config()
+    pending = NotificationEvent.objects.filter(batch='')
+    oldest = pending.order_by('created_at').values_list('created_at', flat=True).first()
+    if oldest is None:
+        return 0
+    if not force and oldest > timezone.now() - config['window'] and pending.count() < config['max_events']:
+        return 0
+
+    # Claim the pending rows so a concurrent flush can't send them twice
+    batch = uuid4().hex
+    pending.update(batch=batch)
+    events = list(NotificationEvent.objects.filter(batch=batch).order_by('created_at'))
+
+    max_events = config['max_events']
+    sent = 0
+    try:
+        with get_connection() as connection:
+            for start in range(0, len(events), max_events):
+                chunk = events[start:start + max_events]
+                connection.send_messages([_digest_message(chunk)])
+                # Mark each email as soon as it's out so a later failure
+                # doesn't send it again
+                NotificationEvent.objects.filter(pk__in=[event.pk for event in chunk]).update(
+                    sent_at=timezone.now())
+                sent += len(chunk)
+    except Exception:
+        # Release only the rows that didn't go out, for the next attempt
+        NotificationEvent.objects.filter(batch=batch, sent_at__isnull=True).update(batch='')
+        raise
+    return sent
+
+
+def prune_sent_events():
+    """Delete sent events older than ``ADMIN_DIGEST_RETENTION_DAYS``"""
+    cutoff = timezone.now() - timedelta(days=settings.ADMIN_DIGEST_RETENTION_DAYS)
+    deleted, _ = NotificationEvent.objects.filter(sent_at__lt=cutoff).delete()
+    return deleted
+
+
+def _digest_message(events):
+    lines = []
+    for event in events:
+        created_at = timezone.localtime(event.created_at)
+        lines.append(f'[{created_at:%Y-%m-%d %H:%M}] {event.subject}\n{event.message}\n')
+    return EmailMessage(
+        subject=f'Rent Manager digest - {len(events)} notification(s)',
+        body='\n'.join(lines),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=admin_recipients(),
+    )
+
+
+def _enqueue(task, *args):
+    try:
+        task.delay(*args)
+    except Exception:
+        # Notification failures shouldn't break the request
+        logger.exception('Could not enqueue %s', task.name)
@@ -0,0 +1,58 @@
+"""
+Move past-due utility bills and rent payments to ``overdue``.
+
+Rows are updated with set-based ``UPDATE`` statements in bounded batches, each
+in its own short transaction, so SQLite never holds the write lock for long.
+"""
+import logging
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import invalidate_dashboards
+from .models import RentPayment, UtilityBill
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def reconcile_overdue(today=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Mark every bill and payment due before ``today`` as overdue; returns counts and timing"""
+    today = today or timezone.localdate()
+    started = time.monotonic()
+
+    bills = _mark_overdue(
+        UtilityBill.objects.filter(status='unpaid', due_date__lt=today),
+        'tenant_id',
+        batch_size,
+    )
+    payments = _mark_overdue(
+        RentPayment.objects.filter(status='pending', due_date__lt=today),
+        'agreement__tenant_id',
+        batch_size,
+    )
+
+    result = {
+        'bills': bills,
+        'payments': payments,
+        'seconds': round(time.monotonic() - started, 3),
+    }
+    logger.info('Marked %(bills)s bill(s) and %(payments)s payment(s) overdue in %(seconds)ss', result)
+    return result
+
+
+def _mark_overdue(queryset, tenant_field, batch_size):
+    updated = 0
+    while True:
+        rows = list(queryset.order_by('pk').values_list('pk', tenant_field)[:batch_size])
+        if not rows:
+            return updated
+
+        with transaction.atomic():
+            updated += queryset.filter(pk__in=[pk for pk, _ in rows]).update(
+                status='overdue',
+                updated_at=timezone.now(),
+            )
+        invalidate_dashboards({tenant_id for _, tenant_id in rows})
@@ -0,0 +1,37 @@
+"""
+Keyset (seek) pagination over ``(due_date, id)``, newest first.
+
+Pages are selected with ``WHERE (due_date, id) < cursor`` instead of an
+OFFSET, so fetching any page costs the same as fetching the first one.
+"""
+from datetime import date
+
+from django.db.models import Q
+
+
+def encode_cursor(row):
+    return f'{row.due_date.isoformat()}.{row.pk}'
+
+
+def decode_cursor(cursor):
+    """Return (due_date, id) for a cursor, or None when missing or malformed"""
+    try:
+        due_date, pk = cursor.split('.')
+        return date.fromisoformat(due_date), int(pk)
+    except (AttributeError, ValueError):
+        return None
+
+
+def keyset_page(queryset, cursor=None, size=12):
+    """Return (rows, next_cursor) for the page following ``cursor``"""
+    position = decode_cursor(cursor)
+    if position:
+        due_date, pk = position
+        # The plain due_date bound lets the database seek the index to the cursor
+        queryset = queryset.filter(due_date__lte=due_date).filter(
+            Q(due_date__lt=due_date) | Q(due_date=due_date, pk__lt=pk)
+        )
+
+    rows = list(queryset.order_by('-due_date', '-pk')[:size + 1])
+    next_cursor = encode_cursor(rows[size - 1]) if len(rows) > size else None
+    return rows[:size], next_cursor
@@ -0,0 +1,215 @@
+"""
+Bulk meter reading import from CSV or JSON.
+
+Input is parsed row by row (CSV, a JSON array or JSON Lines), so memory use
+depends on the chunk size and the number of tenant/meter pairs, not on the
+file size. Every row must be newer than, and not lower than, the latest
+reading known for its tenant and meter, which also enforces
+``MeterReading.unique_together``. Valid rows are inserted with chunked
+``bulk_create`` calls inside one transaction.
+
+Expected fields: ``tenant`` (username), ``meter_type`` (name),
+``reading_value``, ``reading_date`` (YYYY-MM-DD) and optionally ``notes``.
+"""
+import csv
+import json
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from .analytics import schedule_refresh
+from .caching import invalidate_dashboards
+from .models import MeterReading, MeterType, Tenant
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+READ_SIZE = 64 * 1024
+
+
+class ImportReport:
+    """Counts and the first ``MAX_REPORTED_ERRORS`` row errors of an import"""
+
+    def __init__(self):
+        self.created = 0
+        self.rejected = 0
+        self.errors = []
+
+    def reject(self, row, message):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'error': message})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'rejected': self.rejected,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+        }
+
+
+def iter_csv(stream):
+    """Yield the rows of a CSV text stream with a header row"""
+    return csv.DictReader(stream)
+
+
+def iter_json(stream):
+    """Yield the objects of a JSON array or of JSON Lines, decoding one at a time"""
+    decoder = json.JSONDecoder(parse_float=Decimal)
+    buffer = ''
+    eof = False
+    while True:
+        buffer = buffer.lstrip(' \t\r\n,[]')
+        if not buffer:
+            if eof:
+                return
+            chunk = stream.read(READ_SIZE)
+            eof = not chunk
+            buffer += chunk
+            continue
+        try:
+            row, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = stream.read(READ_SIZE)
+            eof = not chunk
+            buffer += chunk
+            continue
+        buffer = buffer[end:]
+        yield row
+
+
+def detect_format(name='', content_type=''):
+    """'json' for .json/.jsonl files or JSON content types, else 'csv'"""
+    if name.lower().endswith(('.json', '.jsonl', '.ndjson')) or 'json' in (content_type or ''):
+        return 'json'
+    return 'csv'
+
+
+def parse_rows(stream, fmt):
+    return iter_json(stream) if fmt == 'json' else iter_csv(stream)
+
+
+def import_readings(rows):
+    """
+    Validate and insert readings from an iterable of dicts; returns an
+    ImportReport whose errors refer to 1-based data row numbers.
+    """
+    report = ImportReport()
+    meter_types = {name: pk for pk, name in MeterType.objects.values_list('pk', 'name')}
+    tenants = {}
+    latest = {}
+    first_imported = {}
+
+    with transaction.atomic():
+        chunk = []
+        for row_number, row in enumerate(rows, start=1):
+            chunk.append((row_number, row))
+            if len(chunk) >= CHUNK_SIZE:
+                _import_chunk(chunk, meter_types, tenants, latest, first_imported, report)
+                chunk = []
+        if chunk:
+            _import_chunk(chunk, meter_types, tenants, latest, first_imported, report)
+
+        # bulk_create skips signals, so refresh derived data explicitly
+        for (tenant_id, meter_type_id), since in first_imported.items():
+            schedule_refresh(tenant_id, meter_type_id, since)
+
+    if first_imported:
+        invalidate_dashboards({tenant_id for tenant_id, _ in first_imported})
+    return report
+
+
+def _import_chunk(chunk, meter_types, tenants, latest, first_imported, report):
+    usernames = {str(row.get('tenant', '')).strip() for _, row in chunk if isinstance(row, dict)}
+    missing = usernames - tenants.keys()
+    if missing:
+        tenants.update(Tenant.objects.filter(user__username__in=missing).values_list('user__username', 'pk'))
+        tenants.update({username: None for username in missing if username not in tenants})
+
+    parsed = []
+    for row_number, row in chunk:
+        try:
+            parsed.append((row_number, _parse_row(row, meter_types, tenants)))
+        except ValueError as exc:
+            report.reject(row_number, str(exc))
+
+    _load_latest({(reading.tenant_id, reading.meter_type_id) for _, reading in parsed} - latest.keys(), latest)
+
+    readings = []
+    for row_number, reading in parsed:
+        key = (reading.tenant_id, reading.meter_type_id)
+        previous = latest.get(key)
+        if previous:
+            previous_date, previous_value = previous
+            if reading.reading_date == previous_date:
+                report.reject(row_number, f'A reading for {reading.reading_date} already exists.')
+                continue
+            if reading.reading_date < previous_date:
+                report.reject(row_number, f'Reading date is before the latest reading ({previous_date}).')
+                continue
+            if reading.reading_value < previous_value:
+                report.reject(row_number, f'Reading value is lower than the previous reading ({previous_value}).')
+                continue
+        latest[key] = (reading.reading_date, reading.reading_value)
+        readings.append(reading)
+        first_imported.setdefault(key, reading.reading_date)
+
+    MeterReading.objects.bulk_create(readings, batch_size=CHUNK_SIZE, ignore_conflicts=True)
+    report.created += len(readings)
+
+
+def _parse_row(row, meter_types, tenants):
+    if not isinstance(row, dict):
+        raise ValueError('Row is not an object.')
+
+    tenant_id = tenants.get(str(row.get('tenant', '')).strip())
+    if tenant_id is None:
+        raise ValueError(f'Unknown tenant "{row.get("tenant", "")}".')
+
+    meter_type_id = meter_types.get(str(row.get('meter_type', '')).strip())
+    if meter_type_id is None:
+        raise ValueError(f'Unknown meter type "{row.get("meter_type", "")}".')
+
+    try:
+        reading_value = Decimal(str(row.get('reading_value', '')).strip())
+    except InvalidOperation:
+        raise ValueError('Invalid reading value.')
+    if not reading_value.is_finite() or reading_value < 0:
+        raise ValueError('Invalid reading value.')
+
+    try:
+        reading_date = date.fromisoformat(str(row.get('reading_date', '')).strip())
+    except ValueError:
+        raise ValueError('Invalid reading date, expected YYYY-MM-DD.')
+
+    return MeterReading(
+        tenant_id=tenant_id,
+        meter_type_id=meter_type_id,
+        reading_value=reading_value.quantize(Decimal('0.01')),
+        reading_date=reading_date,
+        notes=str(row.get('notes') or ''),
+    )
+
+
+def _load_latest(pairs, latest):
+    """Load the latest (date, value) of each (tenant, meter type) pair in one query"""
+    if not pairs:
+        return
+    tenant_ids = {tenant_id for tenant_id, _ in pairs}
+    latest_id = MeterReading.objects.filter(
+        tenant=OuterRef('tenant'),
+        meter_type=OuterRef('meter_type'),
+    ).order_by('-reading_date').values('id')[:1]
+    rows = MeterReading.objects.filter(
+        tenant_id__in=tenant_ids,
+        id=Subquery(latest_id),
+    ).values_list('tenant_id', 'meter_type_id', 'reading_date', 'reading_value')
+    for tenant_id, meter_type_id, reading_date, reading_value in rows:
+        if (tenant_id, meter_type_id) in pairs:
+            latest[(tenant_id, meter_type_id)] = (reading_date, reading_value)
+    # Pairs without readings are remembered too, so they are not queried again
+    for pair in pairs:
+        latest.setdefault(pair, None)
@@ -0,0 +1,112 @@
+"""
+Reading-period calendar for meter types.
+
+``MeterType`` stores its reading period as days of the month, and many
+periods wrap across the month boundary (e.g. 25-5 opens on the 25th and
+closes on the 5th of the next month). The calendar turns them into concrete
+date intervals for a rolling window, moving days past the end of short
+months back to the last day. It is built once per process and dropped when
+a ``MeterType`` is saved or deleted (see ``rent_app.signals``), when the
+date changes, or after ``READING_CALENDAR_TTL`` seconds so changes made by
+other processes are picked up.
+"""
+import threading
+import time
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from django.utils import timezone
+
+from .dates import add_months, clamp_day
+from .models import MeterType
+
+READING_CALENDAR_TTL = 300
+# Periods opening from the previous month up to a year ahead
+WINDOW_MONTHS = 14
+
+_calendar = None
+_calendar_lock = threading.Lock()
+
+
+class ReadingPeriod(NamedTuple):
+    opens: date
+    closes: date
+
+    def contains(self, day):
+        return self.opens <= day <= self.closes
+
+    def days_left(self, day):
+        return (self.closes - day).days
+
+
+def build_periods(start_day, end_day, first_month, months=WINDOW_MONTHS):
+    """Concrete periods opening in each of the ``months`` months from ``first_month``"""
+    periods = []
+    for offset in range(months):
+        month = add_months(first_month, offset)
+        close_month = month if end_day >= start_day else add_months(month, 1)
+        periods.append(ReadingPeriod(clamp_day(month, start_day), clamp_day(close_month, end_day)))
+    return periods
+
+
+class ReadingCalendar:
+    """Precomputed reading periods with O(1) lookups per meter type and day"""
+
+    def __init__(self, meter_types, today):
+        self.today = today
+        self.built_at = time.monotonic()
+        self._periods = {}
+        self._closes = {}
+        self._open_on = {}
+
+        first_month = add_months(today, -1)
+        for meter_type_id, start_day, end_day in meter_types:
+            periods = build_periods(start_day, end_day, first_month)
+            self._periods[meter_type_id] = periods
+            self._closes[meter_type_id] = [period.closes for period in periods]
+            for period in periods:
+                day = period.opens
+                while day <= period.closes:
+                    self._open_on[(meter_type_id, day)] = period
+                    day += timedelta(days=1)
+
+    def current_period(self, meter_type_id, day=None):
+        """The period open on ``day`` (default today), or None"""
+        return self._open_on.get((meter_type_id, day or self.today))
+
+    def is_open(self, meter_type_id, day=None):
+        return (meter_type_id, day or self.today) in self._open_on
+
+    def next_period(self, meter_type_id, day=None):
+        """The period open on ``day`` or, failing that, the next one to open"""
+        day = day or self.today
+        closes = self._closes.get(meter_type_id, [])
+        index = bisect_left(closes, day)
+        return self._periods[meter_type_id][index] if index < len(closes) else None
+
+    def open_meter_types(self, day=None):
+        """IDs of meter types whose reading period is open on ``day``"""
+        day = day or self.today
+        return [meter_type_id for meter_type_id in self._periods if (meter_type_id, day) in self._open_on]
+
+
+def get_calendar():
+    """The process-wide calendar, rebuilt when stale"""
+    global _calendar
+    today = timezone.localdate()
+    calendar = _calendar
+    if calendar is None or calendar.today != today or time.monotonic() - calendar.built_at > READING_CALENDAR_TTL:
+        with _calendar_lock:
+            calendar = ReadingCalendar(
+                MeterType.objects.values_list('id', 'reading_day_start', 'reading_day_end'),
+                today,
+            )
+            _calendar = calendar
+    return calendar
+
+
+def clear_calendar():
+    global _calendar
+    with _calendar_lock:
+        _calendar = None
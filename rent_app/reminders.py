@@ -0,0 +1,141 @@
+"""
+Meter reading reminders.
+
+Once a day, every active tenant who has not submitted a reading for a meter
+whose period closes within ``meter_reading_notification_days`` gets one
+email listing those meters. Tenants are selected in a single query, emails
+go out over one SMTP connection per chunk, and ``ReadingReminder`` rows make
+reruns send nothing twice. When sending fails partway through a chunk, only
+the reminders that weren't delivered are forgotten.
+"""
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import MeterReading, MeterType, ReadingReminder, Tenant
+from .reading_periods import get_calendar
+from .system_settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 200
+
+
+def get_notification_days():
+    return get_setting('meter_reading_notification_days')
+
+
+def closing_periods(today, days):
+    """Active meter types whose open period closes within ``days`` days, with that period"""
+    calendar = get_calendar()
+    closing = []
+    for meter_type in MeterType.objects.filter(is_active=True):
+        period = calendar.current_period(meter_type.id, today)
+        if period and period.days_left(today) <= days:
+            closing.append((meter_type, period))
+    return closing
+
+
+def tenants_missing_readings(closing):
+    """
+    Yield (tenant, [(meter_type, period), ...]) for tenants who neither
+    submitted a reading nor got a reminder for those periods, in one query.
+    """
+    tenants = Tenant.objects.filter(is_active=True).exclude(user__email='').select_related('user')
+    for meter_type, period in closing:
+        tenants = tenants.annotate(**{
+            f'has_reading_{meter_type.id}': Exists(MeterReading.objects.filter(
+                tenant=OuterRef('pk'),
+                meter_type=meter_type,
+                reading_date__range=(period.opens, period.closes),
+            )),
+            f'reminded_{meter_type.id}': Exists(ReadingReminder.objects.filter(
+                tenant=OuterRef('pk'),
+                meter_type=meter_type,
+                period_closes=period.closes,
+            )),
+        })
+
+    for tenant in tenants.order_by('pk').iterator(chunk_size=CHUNK_SIZE):
+        missing = [
+            (meter_type, period) for meter_type, period in closing
+            if not getattr(tenant, f'has_reading_{meter_type.id}')
+            and not getattr(tenant, f'reminded_{meter_type.id}')
+        ]
+        if missing:
+            yield tenant, missing
+
+
+def send_reading_reminders(today=None):
+    """Send due reminders; returns the number of emails sent"""
+    today = today or timezone.localdate()
+    closing = closing_periods(today, get_notification_days())
+    if not closing:
+        return 0
+
+    sent = 0
+    chunk = []
+    for tenant, missing in tenants_missing_readings(closing):
+        chunk.append((tenant, missing))
+        if len(chunk) >= CHUNK_SIZE:
+            sent += _send_chunk(chunk)
+            chunk = []
+    if chunk:
+        sent += _send_chunk(chunk)
+
+    logger.info('Sent %s meter reading reminder(s)', sent)
+    return sent
+
+
+def _send_chunk(chunk):
+    # Log before sending so a rerun never emails the same reminder twice
+    reminders = [
+        ReadingReminder(tenant=tenant, meter_type=meter_type, period_closes=period.closes)
+        for tenant, missing in chunk
+        for meter_type, period in missing
+    ]
+    ReadingReminder.objects.bulk_create(reminders, batch_size=500, ignore_conflicts=True)
+
+    sent = 0
+    try:
+        with get_connection() as connection:
+            for tenant, missing in chunk:
+                connection.send_messages([_reminder_message(tenant, missing)])
+                sent += 1
+    except Exception:
+        # Forget only the reminders that didn't go out, so the next run retries
+        # them without emailing the tenants already reached
+        _forget(chunk[sent:])
+        raise
+    return sent
+
+
+def _forget(chunk):
+    logged = Q()
+    for tenant, missing in chunk:
+        for meter_type, period in missing:
+            logged |= Q(tenant=tenant, meter_type=meter_type, period_closes=period.closes)
+    if logged:
+        ReadingReminder.objects.filter(logged).delete()
+
+
+def _reminder_message(tenant, missing):
+    lines = [
+        f'- {meter_type.name}: reading period closes on {period.closes:%b %d, %Y}'
+        for meter_type, period in missing
+    ]
+    body = (
+        f'Hello {tenant.user.get_full_name() or tenant.user.username},\n\n'
+        f'Please submit your meter readings before the reading period closes:\n\n'
+        + '\n'.join(lines)
+        + '\n\nThank you,\nRent Manager'
+    )
+    return EmailMessage(
+        subject='Meter reading reminder',
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[tenant.user.email],
+    )
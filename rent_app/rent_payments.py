@@ -0,0 +1,94 @@
+"""
+Monthly rent payment generation.
+
+One ``RentPayment`` is created per agreement and month it covers
+(``start_date`` to ``end_date``, so backfills include agreements that have
+ended since) with a single ``bulk_create``. The EUR/RON rate is looked up
+once per month through the cached exchange-rate service. Agreements that
+already have a payment due in the month are skipped. When a concurrent run
+inserts one first, the ``(agreement, due_date)`` unique constraint rejects
+the batch, which is retried without the payments that now exist.
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .caching import invalidate_dashboards
+from .dates import clamp_day, month_end, month_range
+from .exchange_rates import get_rate
+from .models import RentAgreement, RentPayment
+from .system_settings import get_setting
+
+BATCH_SIZE = 500
+
+
+def get_due_day():
+    return get_setting('rent_due_day')
+
+
+def generate_rent_payments(first_month=None, last_month=None):
+    """Create missing rent payments for every month in the range; returns the number created"""
+    first_month = first_month or timezone.localdate().replace(day=1)
+    last_month = last_month or first_month
+    due_day = get_due_day()
+
+    # Deactivated agreements without an end date have no months to bill
+    agreements = list(
+        RentAgreement.objects.filter(Q(is_active=True) | Q(end_date__isnull=False)).values_list(
+            'id', 'tenant_id', 'monthly_rent_eur', 'start_date', 'end_date'
+        )
+    )
+    tenants = {agreement_id: tenant_id for agreement_id, tenant_id, *_ in agreements}
+    created = 0
+    tenant_ids = set()
+
+    for month in month_range(first_month, last_month):
+        last_day = month_end(month)
+        due_date = clamp_day(month, due_day)
+        existing = _agreements_paying(month, last_day)
+        rate = get_rate(due_date)
+
+        payments = []
+        for agreement_id, _, rent_eur, start_date, end_date in agreements:
+            if agreement_id in existing or start_date > last_day or (end_date and end_date < month):
+                continue
+            payments.append(RentPayment(
+                agreement_id=agreement_id,
+                amount_eur=rent_eur,
+                amount_ron=(rent_eur * rate).quantize(Decimal('0.01')),
+                exchange_rate=rate,
+                due_date=due_date,
+            ))
+
+        inserted = _insert(payments, month, last_day)
+        created += len(inserted)
+        tenant_ids.update(tenants[payment.agreement_id] for payment in inserted)
+
+    if tenant_ids:
+        invalidate_dashboards(tenant_ids)
+    return created
+
+
+def _agreements_paying(month, last_day):
+    # Any payment in the month counts, wherever its due day is (hand-entered, or before a rent_due_day change)
+    return set(RentPayment.objects.filter(
+        due_date__gte=month, due_date__lte=last_day
+    ).values_list('agreement_id', flat=True))
+
+
+def _insert(payments, month, last_day):
+    """Insert ``payments``, leaving out those a concurrent run inserted first; returns the inserted ones"""
+    while payments:
+        try:
+            with transaction.atomic():
+                RentPayment.objects.bulk_create(payments, batch_size=BATCH_SIZE)
+            return payments
+        except IntegrityError:
+            existing = _agreements_paying(month, last_day)
+            remaining = [payment for payment in payments if payment.agreement_id not in existing]
+            if len(remaining) == len(payments):
+                raise
+            payments = remaining
+    return []
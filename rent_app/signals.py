@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .analytics import schedule_refresh
+from .caching import invalidate_dashboards, invalidate_user_dashboard
+from .models import MeterReading, MeterType, RentAgreement, RentPayment, SystemSettings, Tenant, UtilityBill
+from .reading_periods import clear_calendar
+from .system_settings import settings_changed
+
+
+@receiver([post_save, post_delete], sender=Tenant)
+def tenant_changed(sender, instance, **kwargs):
+    invalidate_user_dashboard(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=RentAgreement)
+@receiver([post_save, post_delete], sender=UtilityBill)
+@receiver([post_save, post_delete], sender=MeterReading)
+def tenant_row_changed(sender, instance, **kwargs):
+    invalidate_dashboards([instance.tenant_id])
+
+
+@receiver([post_save, post_delete], sender=RentPayment)
+def rent_payment_changed(sender, instance, **kwargs):
+    invalidate_dashboards(
+        RentAgreement.objects.filter(pk=instance.agreement_id).values('tenant_id')
+    )
+
+
+@receiver([post_save, post_delete], sender=MeterType)
+def meter_type_changed(sender, instance, **kwargs):
+    clear_calendar()
+
+
+@receiver([post_save, post_delete], sender=SystemSettings)
+def system_setting_changed(sender, instance, **kwargs):
+    # After commit, so other processes can't reload the old value under the new version
+    transaction.on_commit(settings_changed)
+
+
+@receiver(post_save, sender=MeterReading)
+def meter_reading_saved(sender, instance, created, **kwargs):
+    # New readings only affect their month onward; edits may have moved the date
+    schedule_refresh(instance.tenant_id, instance.meter_type_id, instance.reading_date if created else None)
+
+
+@receiver(post_delete, sender=MeterReading)
+def meter_reading_deleted(sender, instance, **kwargs):
+    schedule_refresh(instance.tenant_id, instance.meter_type_id, instance.reading_date)
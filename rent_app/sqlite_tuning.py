@@ -0,0 +1,35 @@
+"""
+SQLite performance profile, enabled with ``SQLITE_TUNING``.
+
+Every new SQLite connection switches to WAL journaling, so readers and the
+single writer no longer block each other, with ``synchronous=NORMAL`` (safe
+in WAL mode, fsyncs only at checkpoints). A busy timeout makes concurrent
+writers wait for the lock instead of failing with "database is locked", and
+memory-mapped I/O plus a larger page cache speed up reads.
+"""
+from django.conf import settings
+
+
+def pragmas():
+    """(name, value) pairs applied to every new connection"""
+    return [
+        ('journal_mode', 'WAL'),
+        ('synchronous', 'NORMAL'),
+        ('busy_timeout', settings.SQLITE_BUSY_TIMEOUT),
+        ('mmap_size', settings.SQLITE_MMAP_SIZE),
+        # Negative values are KiB, positive values pages
+        ('cache_size', settings.SQLITE_CACHE_SIZE),
+    ]
+
+
+def apply_pragmas(cursor, values):
+    for name, value in values:
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_connection(sender, connection, **kwargs):
+    """``connection_created`` receiver"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, pragmas())
@@ -0,0 +1,141 @@
+"""
+Typed access to the ``SystemSettings`` table.
+
+Every setting the code reads is declared in ``SETTINGS`` with a parser and a
+default. ``get_setting`` serves parsed values from a per-process dict that
+is loaded with one query; missing or unparsable rows fall back to the
+default. Saving or deleting a ``SystemSettings`` row bumps a version stamp
+in the shared cache (see ``rent_app.signals``), and each process compares
+its copy against that stamp at most every ``SYSTEM_SETTINGS_CHECK_INTERVAL``
+seconds, so changes reach all gunicorn workers and Celery processes without
+a query per read. The stamp only reaches other processes through a shared
+cache, so each copy is also reloaded once it is ``SYSTEM_SETTINGS_MAX_AGE``
+seconds old, whatever the stamp says.
+"""
+import logging
+import time
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, NamedTuple
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import SystemSettings
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'rent_app:system_settings:version'
+
+
+class Setting(NamedTuple):
+    key: str
+    parse: Callable[[str], Any]
+    default: Any
+    description: str
+
+
+def _decimal(value):
+    try:
+        result = Decimal(value.strip())
+    except InvalidOperation:
+        raise ValueError(f'"{value}" is not a number')
+    if not result.is_finite() or result <= 0:
+        raise ValueError(f'"{value}" is not a positive number')
+    return result
+
+
+def _int_between(low, high=None):
+    def parse(value):
+        result = int(value.strip())
+        if result < low or (high is not None and result > high):
+            raise ValueError(f'{result} is out of range')
+        return result
+    return parse
+
+
+def _choice(*choices):
+    def parse(value):
+        result = value.strip().lower()
+        if result not in choices:
+            raise ValueError(f'"{value}" is not one of: {", ".join(choices)}')
+        return result
+    return parse
+
+
+def _url(value):
+    value = value.strip()
+    if not value:
+        raise ValueError('URL is empty')
+    return value
+
+
+SETTINGS = {setting.key: setting for setting in [
+    Setting('bnr_exchange_rate_url', _url, 'https://www.bnr.ro/nbrfxrates.xml',
+            'BNR XML feed URL for exchange rates'),
+    Setting('default_exchange_rate', _decimal, Decimal('5.00'),
+            'Default EUR to RON exchange rate when BNR is unavailable'),
+    Setting('meter_reading_notification_days', _int_between(0), 3,
+            'Days before reading period ends to send notification'),
+    Setting('rent_due_day', _int_between(1, 31), 1,
+            'Day of month generated rent payments are due'),
+    Setting('admin_notification_mode', _choice('immediate', 'digest'), 'immediate',
+            'Admin notification delivery: immediate (one email per event) or digest'),
+    Setting('admin_digest_window_minutes', _int_between(1), 60,
+            'Digest mode: minutes to buffer admin notifications before sending'),
+    Setting('admin_digest_max_events', _int_between(1), 50,
+            'Digest mode: send early once this many notifications are buffered (also the max per email)'),
+]}
+
+
+class _State(NamedTuple):
+    version: Any  # shared version the values were loaded at
+    check_at: float  # monotonic time of the next version check
+    expires_at: float  # monotonic time the values are reloaded regardless of the version
+    values: dict
+
+
+_state = None
+
+
+def get_setting(key):
+    """Parsed value of a declared setting"""
+    global _state
+    state = _state
+    now = time.monotonic()
+    if state is None or now > state.check_at:
+        version = cache.get(VERSION_KEY)
+        if state is not None and state.version == version and now < state.expires_at:
+            values, expires_at = state.values, state.expires_at
+        else:
+            values, expires_at = _load(), now + settings.SYSTEM_SETTINGS_MAX_AGE
+        state = _state = _State(version, now + settings.SYSTEM_SETTINGS_CHECK_INTERVAL, expires_at, values)
+    return state.values[key]
+
+
+def validate(key, value):
+    """Parse ``value`` for ``key``; raises ValueError when invalid. Undeclared keys pass."""
+    setting = SETTINGS.get(key)
+    if setting is None:
+        return value
+    try:
+        return setting.parse(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f'Invalid value for {key}: {exc}')
+
+
+def settings_changed():
+    """Drop this process's copy and make every other process reload"""
+    global _state
+    _state = None
+    cache.set(VERSION_KEY, uuid4().hex, None)
+
+
+def _load():
+    values = {key: setting.default for key, setting in SETTINGS.items()}
+    for key, value in SystemSettings.objects.filter(key__in=SETTINGS).values_list('key', 'value'):
+        try:
+            values[key] = validate(key, value)
+        except ValueError as exc:
+            logger.warning('%s, using the default %s', exc, SETTINGS[key].default)
+    return values
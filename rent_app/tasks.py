@@ -0,0 +1,94 @@
+import logging
+from datetime import date
+from smtplib import SMTPException
+
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import send_mail
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=5,
+)
+def send_email(self, subject, message, recipient_list, from_email=None):
+    """Send one email from the worker, retrying with exponential backoff on SMTP errors"""
+    return send_mail(
+        subject=subject,
+        message=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipient_list=recipient_list,
+        # Without a broker the task runs inside the request: one attempt, and never fail it
+        fail_silently=self.request.is_eager,
+    )
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    max_retries=5,
+)
+def flush_admin_digest(self, force=False):
+    """Send buffered admin notifications as digest emails"""
+    from .notifications import flush_admin_digest
+    if not self.request.is_eager:
+        return flush_admin_digest(force=force)
+    try:
+        return flush_admin_digest(force=force)
+    except (SMTPException, OSError):
+        # The events are released and go out with the next flush
+        logger.exception('Could not send the admin digest')
+        return 0
+
+
+@shared_task
+def mark_overdue():
+    """Move past-due bills and rent payments to overdue"""
+    from .overdue import reconcile_overdue
+    return reconcile_overdue()
+
+
+@shared_task
+def generate_rent_payments():
+    """Create this month's rent payment for every agreement running this month"""
+    from .rent_payments import generate_rent_payments
+    return generate_rent_payments()
+
+
+@shared_task(
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    max_retries=5,
+)
+def send_reading_reminders():
+    """Remind tenants of meter reading periods about to close"""
+    from .reminders import send_reading_reminders
+    return send_reading_reminders()
+
+
+@shared_task(
+    autoretry_for=(OSError,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    max_retries=5,
+)
+def refresh_exchange_rates():
+    """Fetch and store the day's BNR rates"""
+    from .exchange_rates import refresh_rates
+    return len(refresh_rates())
+
+
+@shared_task
+def refresh_monthly_consumption(tenant_id, meter_type_id, since=None):
+    """Recompute materialized monthly consumption for one tenant and meter"""
+    from .analytics import refresh_monthly_consumption
+    return refresh_monthly_consumption(tenant_id, meter_type_id, date.fromisoformat(since) if since else None)
@@ -0,0 +1,35 @@
+"""
+Django template backend that reports render time to ``rent_app.metrics``.
+Settings switch to it when ``PERF_METRICS`` is on.
+"""
+import time
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from .metrics import current_request
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        metrics = current_request()
+        if metrics is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.add_template(time.perf_counter() - started)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    # Only top-level templates are wrapped, so includes and extends aren't counted twice
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,44 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from rent_app import system_settings
+from rent_app.exchange_rates import clear_cache
+
+from .utils import create_tenant
+
+# Queries per changelist, the same with one row as with many, with cold per-process caches
+CHANGELISTS = [
+    ('/admin/rent_app/utilitybill/', 6),
+    ('/admin/rent_app/utilitybill/?tenant__id__exact={tenant}', 7),
+    ('/admin/auth/user/', 6),
+    # Includes loading the system settings and the current exchange rate
+    ('/admin/rent_app/rentagreement/', 7),
+    ('/admin/rent_app/rentpayment/', 5),
+    ('/admin/rent_app/meterreading/', 6),
+]
+
+
+class ChangelistQueryCountTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', password='pass'))
+        self.addCleanup(setattr, system_settings, '_state', None)
+        self.addCleanup(clear_cache)
+
+    def assert_changelists(self, tenant):
+        for url, queries in CHANGELISTS:
+            url = url.format(tenant=tenant.id)
+            with self.subTest(url=url):
+                clear_cache()
+                system_settings._state = None
+                with self.assertNumQueries(queries):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_one_row(self):
+        self.assert_changelists(create_tenant('tenant'))
+
+    def test_many_rows(self):
+        tenant = create_tenant('tenant', rows=20)
+        for number in range(10):
+            create_tenant(f'tenant{number}', rows=3)
+        self.assert_changelists(tenant)
@@ -0,0 +1,101 @@
+import random
+from datetime import date
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase
+
+from rent_app.bill_splitting import allocate, split_invoice
+from rent_app.models import BuildingInvoice, MeterReading, MeterType, UtilityBill, UtilityType
+
+from .utils import create_tenant
+
+
+class AllocateTests(SimpleTestCase):
+    def test_shares_sum_to_the_amount(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            amount = Decimal(rng.randint(0, 10 ** 7)).scaleb(-2)
+            weights = {key: Decimal(rng.randint(0, 10 ** 5)).scaleb(-2) for key in range(rng.randint(1, 12))}
+            weights[0] += 1
+            with self.subTest(amount=amount, weights=weights):
+                self.assertEqual(sum(allocate(amount, weights).values()), amount)
+
+    def test_ties_go_to_the_lower_key(self):
+        self.assertEqual(
+            allocate(Decimal('100.00'), {3: 1, 1: 1, 2: 1}),
+            {1: Decimal('33.34'), 2: Decimal('33.33'), 3: Decimal('33.33')},
+        )
+        self.assertEqual(
+            allocate(Decimal('0.02'), {'c': 1, 'a': 1, 'b': 1}),
+            {'a': Decimal('0.01'), 'b': Decimal('0.01'), 'c': Decimal('0.00')},
+        )
+
+    def test_largest_remainder_first(self):
+        # 10.00 by 1:2 is 3.333... and 6.666..., so the spare cent goes to the larger remainder
+        self.assertEqual(allocate(Decimal('10.00'), {1: 1, 2: 2}), {1: Decimal('3.33'), 2: Decimal('6.67')})
+
+    def test_nothing_to_allocate_by(self):
+        with self.assertRaises(ValueError):
+            allocate(Decimal('10.00'), {1: 0, 2: 0})
+
+
+class SplitInvoiceTests(TestCase):
+    def setUp(self):
+        self.tenants = [create_tenant(f'tenant{number}', rows=0) for number in range(3)]
+        self.electricity = UtilityType.objects.get(name='Electricity')
+        self.meter_type = MeterType.objects.get(name='Electricity')
+
+    def invoice(self, utility_type, amount, split_method='auto'):
+        return BuildingInvoice.objects.create(
+            utility_type=utility_type, amount=Decimal(amount), split_method=split_method,
+            period_start=date(2024, 3, 1), period_end=date(2024, 3, 31), due_date=date(2024, 4, 20),
+        )
+
+    def reading(self, tenant, day, value):
+        return MeterReading.objects.create(
+            tenant=tenant, meter_type=self.meter_type, reading_date=day, reading_value=Decimal(value)
+        )
+
+    def test_equal_split(self):
+        internet = UtilityType.objects.create(name='Internet')
+        invoice = self.invoice(internet, '100.00')
+
+        bills = split_invoice(invoice.pk)
+
+        self.assertEqual([bill.amount for bill in bills], [Decimal('33.34'), Decimal('33.33'), Decimal('33.33')])
+        self.assertEqual(UtilityBill.objects.filter(building_invoice=invoice).count(), 3)
+        invoice.refresh_from_db()
+        self.assertTrue(invoice.is_split)
+
+    def test_consumption_split(self):
+        first, second, third = self.tenants
+        before = self.reading(first, date(2024, 2, 28), 1000)
+        in_period = [
+            self.reading(first, date(2024, 3, 10), 1050),
+            self.reading(first, date(2024, 3, 30), 1100),
+            self.reading(second, date(2024, 3, 1), 0),
+            self.reading(second, date(2024, 3, 31), 300),
+        ]
+        # The third tenant read nothing in the period, so gets no bill
+        self.reading(third, date(2024, 4, 2), 50)
+
+        bills = split_invoice(self.invoice(self.electricity, '200.01').pk)
+
+        self.assertEqual(
+            {bill.tenant_id: bill.amount for bill in bills},
+            {first.pk: Decimal('50.00'), second.pk: Decimal('150.01')},
+        )
+        self.assertEqual(sum(bill.amount for bill in bills), Decimal('200.01'))
+        self.assertEqual(
+            set(MeterReading.objects.filter(is_processed=True).values_list('pk', flat=True)),
+            {reading.pk for reading in in_period},
+        )
+        before.refresh_from_db()
+        self.assertFalse(before.is_processed)
+
+    def test_split_only_once(self):
+        invoice = self.invoice(self.electricity, '90.00', split_method='equal')
+        split_invoice(invoice.pk)
+        with self.assertRaisesMessage(ValueError, 'already been split'):
+            split_invoice(invoice.pk)
+        self.assertEqual(UtilityBill.objects.count(), 3)
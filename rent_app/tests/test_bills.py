@@ -0,0 +1,59 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from rent_app.bills import tenant_bill_summary
+from rent_app.models import UtilityBill, UtilityType
+
+from .utils import create_tenant
+
+
+class TenantBillSummaryTests(TestCase):
+    def setUp(self):
+        self.tenant = create_tenant('tenant', rows=0)
+        create_tenant('other', rows=3)
+        self.utility_type = UtilityType.objects.get()
+
+    def bill(self, day, amount, status):
+        return UtilityBill.objects.create(
+            utility_type=self.utility_type, tenant=self.tenant, amount=Decimal(amount),
+            due_date=date(2024, 1, day), status=status,
+        )
+
+    def test_counts_totals_and_lists(self):
+        overdue = self.bill(3, '10.50', 'overdue')
+        unpaid = [self.bill(day, '20.00', 'unpaid') for day in (9, 5)]
+        paid = [self.bill(day, '1.25', 'paid') for day in range(10, 16)]
+
+        with self.assertNumQueries(2):
+            summary = tenant_bill_summary(self.tenant, paid_limit=4)
+
+        self.assertEqual(summary['counts'], {'unpaid': 2, 'paid': 6, 'overdue': 1})
+        self.assertEqual(summary['totals'], {'unpaid': Decimal('40.00'), 'paid': Decimal('7.50'), 'overdue': Decimal('10.50')})
+        self.assertEqual(summary['unpaid'], unpaid[::-1])
+        self.assertEqual(summary['overdue'], [overdue])
+        # The most recent paid bills, newest first
+        self.assertEqual(summary['paid'], paid[:1:-1])
+        self.assertEqual(summary['open'], [overdue, unpaid[1], unpaid[0]])
+        self.assertEqual(summary['open_count'], 3)
+        with self.assertNumQueries(0):
+            [bill.utility_type.name for bill in summary['open'] + summary['paid']]
+
+    def test_without_paid_bills(self):
+        self.bill(1, '5.00', 'paid')
+        summary = tenant_bill_summary(self.tenant, paid_limit=0)
+        self.assertEqual(summary['paid'], [])
+        self.assertEqual(summary['counts']['paid'], 1)
+
+
+class UtilityBillsPageTests(TestCase):
+    def test_constant_query_count(self):
+        for username, rows in (('one', 1), ('many', 30)):
+            with self.subTest(rows=rows):
+                tenant = create_tenant(username, rows)
+                self.client.force_login(tenant.user)
+                # Session, user, tenant, the aggregate and the listed bills
+                with self.assertNumQueries(5):
+                    response = self.client.get('/utilities/')
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,40 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from rent_app.bulk_updates import regenerate_ron_amounts
+from rent_app.exchange_rates import clear_cache, eur_to_ron
+from rent_app.models import ExchangeRate, RentPayment
+
+from .utils import create_tenant
+
+
+class RegenerateRonAmountsTests(TestCase):
+    def setUp(self):
+        clear_cache()
+        self.addCleanup(clear_cache)
+        ExchangeRate.objects.create(date=date(2024, 1, 1), rate=Decimal('4.9765'))
+        self.agreement = create_tenant('tenant', rows=0).rentagreement
+
+    def payment(self, day, amount_eur, status='pending'):
+        return RentPayment.objects.create(
+            agreement=self.agreement, amount_eur=Decimal(amount_eur), amount_ron=Decimal('0'),
+            exchange_rate=Decimal('5'), due_date=date(2024, 1, day), status=status,
+        )
+
+    def test_rounds_like_eur_to_ron(self):
+        # 10.00 * 4.9765 = 49.765, which rounds half to even
+        payments = [self.payment(day, amount) for day, amount in enumerate(('10.00', '10.10', '123.45', '500.00'), 1)]
+        paid = self.payment(10, '10.00', status='paid')
+
+        changed = regenerate_ron_amounts(RentPayment.objects.all())
+
+        self.assertEqual(sorted(changed), [payment.pk for payment in payments])
+        for payment in payments:
+            payment.refresh_from_db()
+            self.assertEqual(payment.exchange_rate, Decimal('4.9765'))
+            self.assertEqual(payment.amount_ron, eur_to_ron(payment.amount_eur, payment.due_date))
+        self.assertEqual(payments[0].amount_ron, Decimal('49.76'))
+        paid.refresh_from_db()
+        self.assertEqual(paid.amount_ron, Decimal('0'))
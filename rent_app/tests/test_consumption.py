@@ -0,0 +1,73 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.db import DatabaseError, transaction
+from django.test import TestCase
+
+from rent_app.models import MeterReading, MeterType, MonthlyConsumption
+
+from .utils import create_tenant
+
+
+class MeterConsumptionTests(TestCase):
+    def setUp(self):
+        self.tenant = create_tenant('tenant', rows=0)
+        for name in ('Gas', 'Water'):
+            MeterType.objects.create(name=name, unit='m3', reading_day_start=20, reading_day_end=10)
+        for index, meter_type in enumerate(MeterType.objects.order_by('name')):
+            for month in range(1, 7):
+                MonthlyConsumption.objects.create(
+                    tenant=self.tenant, meter_type=meter_type, month=date(2024, month, 1),
+                    consumption=Decimal(10 * (index + 1) + month), reading_count=1,
+                )
+        self.client.force_login(self.tenant.user)
+
+    def test_one_query_for_all_meters(self):
+        # Session, user, tenant, meter types and consumption
+        with self.assertNumQueries(5):
+            response = self.client.get('/meters/consumption/')
+
+        meters = {meter['meter_type']: meter['months'] for meter in response.json()['meters']}
+        self.assertEqual(sorted(meters), ['Electricity', 'Gas', 'Water'])
+        gas = meters['Gas']
+        self.assertEqual([row['month'] for row in gas], [f'2024-0{month}-01' for month in range(1, 7)])
+        self.assertEqual(gas[2]['rolling_mean'], 22.0)
+
+
+class ScheduleRefreshTests(TestCase):
+    def setUp(self):
+        self.tenant = create_tenant('tenant', rows=0)
+        self.electricity = MeterType.objects.get()
+        self.gas = MeterType.objects.create(name='Gas', unit='m3', reading_day_start=20, reading_day_end=10)
+        patcher = mock.patch('rent_app.tasks.refresh_monthly_consumption.delay')
+        self.delay = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def reading(self, meter_type, day, value):
+        return MeterReading.objects.create(tenant=self.tenant, meter_type=meter_type, reading_date=day, reading_value=value)
+
+    def test_one_refresh_per_pair_and_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for day, value in [(date(2024, 3, 5), 300), (date(2024, 1, 5), 100), (date(2024, 2, 5), 200)]:
+                self.reading(self.electricity, day, value)
+            self.reading(self.gas, date(2024, 2, 5), 1)
+            MeterReading.objects.filter(reading_value=300).get().delete()
+
+        self.assertCountEqual(self.delay.call_args_list, [
+            mock.call(self.tenant.id, self.electricity.id, '2024-01-05'),
+            mock.call(self.tenant.id, self.gas.id, '2024-02-05'),
+        ])
+
+    def test_rolled_back_changes_are_not_refreshed(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.reading(self.electricity, date(2024, 1, 5), 100)
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+            self.reading(self.gas, date(2024, 2, 5), 1)
+
+        self.assertEqual(len(callbacks), 1)
+        self.delay.assert_called_once_with(self.tenant.id, self.gas.id, '2024-02-05')
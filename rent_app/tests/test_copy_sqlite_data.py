@@ -0,0 +1,85 @@
+import tempfile
+from io import StringIO
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import TransactionTestCase
+
+from rent_app.management.commands.copy_sqlite_data import SOURCE_ALIAS, _add_source_database
+from rent_app.models import MeterReading, MeterType, RentAgreement, RentPayment, Tenant, UtilityBill, UtilityType
+
+COPIED = [User, Tenant, RentAgreement, RentPayment, UtilityType, UtilityBill, MeterType, MeterReading]
+CREATED_AT = datetime(2021, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class CopySqliteDataTests(TransactionTestCase):
+    """Copies a SQLite file into the test database, whichever backend that is"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.source = Path(directory.name) / 'db.sqlite3'
+        _add_source_database(self.source)
+        self.addCleanup(self.remove_source)
+        call_command('migrate', database=SOURCE_ALIAS, verbosity=0)
+        self.fill_source()
+
+    def remove_source(self):
+        connections[SOURCE_ALIAS].close()
+        del connections[SOURCE_ALIAS]
+        del connections.settings[SOURCE_ALIAS]
+
+    def fill_source(self):
+        # Bulk inserts, so no signals touch the test database
+        db = SOURCE_ALIAS
+        users = User.objects.using(db).bulk_create(
+            User(id=10 + number, username=f'tenant{number}', password='x') for number in range(3)
+        )
+        tenants = Tenant.objects.using(db).bulk_create(Tenant(id=20 + n, user=user) for n, user in enumerate(users))
+        agreements = RentAgreement.objects.using(db).bulk_create(
+            RentAgreement(tenant=tenant, monthly_rent_eur=Decimal('450.00'), start_date=date(2021, 1, 1))
+            for tenant in tenants
+        )
+        RentPayment.objects.using(db).bulk_create(
+            RentPayment(agreement=agreement, amount_eur=Decimal('450.00'), amount_ron=Decimal('2239.43'),
+                        exchange_rate=Decimal('4.9765'), due_date=date(2021, month, 1), status='paid')
+            for agreement in agreements for month in range(1, 4)
+        )
+        [utility_type] = UtilityType.objects.using(db).bulk_create([UtilityType(name='Gas')])
+        [meter_type] = MeterType.objects.using(db).bulk_create([
+            MeterType(name='Gas', unit='m3', reading_day_start=20, reading_day_end=10)
+        ])
+        UtilityBill.objects.using(db).bulk_create(
+            UtilityBill(utility_type=utility_type, tenant=tenant, amount=Decimal('99.90'), due_date=date(2021, 2, 20))
+            for tenant in tenants
+        )
+        MeterReading.objects.using(db).bulk_create(
+            MeterReading(meter_type=meter_type, tenant=tenant, reading_value=Decimal(100 * month),
+                         reading_date=date(2021, month, 1))
+            for tenant in tenants for month in range(1, 4)
+        )
+        RentPayment.objects.using(db).update(created_at=CREATED_AT, updated_at=CREATED_AT)
+
+    def rows(self, model, using):
+        return list(model._base_manager.using(using).order_by('pk').values())
+
+    def test_round_trip(self):
+        call_command('copy_sqlite_data', source=str(self.source), batch_size=2, stdout=StringIO())
+
+        for model in COPIED:
+            with self.subTest(model=model._meta.label):
+                self.assertEqual(self.rows(model, 'default'), self.rows(model, SOURCE_ALIAS))
+        self.assertEqual(set(RentPayment.objects.values_list('created_at', flat=True)), {CREATED_AT})
+
+        # Sequences continue after the copied keys
+        user = User.objects.create(username='new')
+        self.assertGreater(user.pk, 12)
+
+    def test_refuses_a_target_with_data(self):
+        User.objects.create(username='existing')
+        with self.assertRaisesMessage(CommandError, 'already has data'):
+            call_command('copy_sqlite_data', source=str(self.source))
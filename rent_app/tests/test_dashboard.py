@@ -0,0 +1,70 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from rent_app.caching import get_dashboard_context, invalidate_user_dashboard
+from rent_app.exchange_rates import clear_cache
+from rent_app.models import ExchangeRate, MeterReading, RentPayment, UtilityBill
+
+from .utils import create_tenant
+
+
+class DashboardQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_cache()
+        ExchangeRate.objects.create(date=date(2020, 1, 1), rate=Decimal('4.9765'))
+
+    def request_dashboard(self, tenant):
+        self.client.force_login(tenant.user)
+        # Fill the process-wide caches (settings, rates) so only the dashboard's own queries remain
+        self.client.get('/dashboard/')
+        invalidate_user_dashboard(tenant.user_id)
+
+    def test_cold_dashboard_is_constant(self):
+        for username, rows in (('one', 1), ('many', 20)):
+            with self.subTest(rows=rows):
+                tenant = create_tenant(username, rows)
+                self.request_dashboard(tenant)
+                with self.assertNumQueries(8):
+                    response = self.client.get('/dashboard/')
+                self.assertEqual(response.status_code, 200)
+
+    def test_cached_dashboard(self):
+        tenant = create_tenant('cached', 5)
+        self.request_dashboard(tenant)
+        self.client.get('/dashboard/')
+        # Session and user only
+        with self.assertNumQueries(2):
+            response = self.client.get('/dashboard/')
+        self.assertEqual(response.status_code, 200)
+
+
+class DashboardInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tenant = create_tenant('tenant', 2)
+        self.other = create_tenant('other', 2)
+
+    def cache_dashboards(self):
+        for tenant in (self.tenant, self.other):
+            self.client.force_login(tenant.user)
+            self.client.get('/dashboard/')
+            self.assertIsNotNone(get_dashboard_context(tenant.user_id))
+
+    def test_changes_drop_only_their_tenant(self):
+        changes = {
+            'payment': lambda: RentPayment.objects.filter(agreement__tenant=self.tenant).first().save(),
+            'bill': lambda: UtilityBill.objects.filter(tenant=self.tenant).first().delete(),
+            'reading': lambda: MeterReading.objects.filter(tenant=self.tenant).first().save(),
+            'agreement': lambda: self.tenant.rentagreement.save(),
+        }
+        for name, change in changes.items():
+            with self.subTest(name):
+                self.cache_dashboards()
+                with self.captureOnCommitCallbacks(execute=True):
+                    change()
+                self.assertIsNone(get_dashboard_context(self.tenant.user_id))
+                self.assertIsNotNone(get_dashboard_context(self.other.user_id))
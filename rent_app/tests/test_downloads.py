@@ -0,0 +1,64 @@
+import tempfile
+from urllib.parse import parse_qs, urlparse
+
+from django.core.files.base import ContentFile
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, override_settings
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from rent_app import async_views
+from rent_app.downloads import CHUNK_SIZE, _presigned_redirect
+from rent_app.models import UtilityBill
+
+from .utils import create_tenant
+
+
+class StoredFile:
+    def __init__(self, storage, name):
+        self.storage = storage
+        self.name = name
+
+
+class PresignedRedirectTests(SimpleTestCase):
+    @override_settings(BILL_DOWNLOAD_URL_EXPIRE=300)
+    def test_signed_with_custom_domain(self):
+        storage = S3Boto3Storage(
+            access_key='key', secret_key='secret', bucket_name='bills', region_name='auto',
+            endpoint_url='https://account.r2.cloudflarestorage.com',
+            custom_domain='files.example.com', location='media',
+        )
+        response = _presigned_redirect(StoredFile(storage, 'utility_bills/bill.pdf'), 'Gas.pdf')
+
+        url = urlparse(response['Location'])
+        query = parse_qs(url.query)
+        self.assertEqual(url.path, '/bills/media/utility_bills/bill.pdf')
+        self.assertEqual(query['X-Amz-Expires'], ['300'])
+        self.assertIn('X-Amz-Signature', query)
+        self.assertEqual(query['response-content-disposition'], ['attachment; filename="Gas.pdf"'])
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), BILL_DOWNLOAD_REDIRECT=False)
+class AsyncDownloadTests(TestCase):
+    def setUp(self):
+        tenant = create_tenant('tenant')
+        self.bill = UtilityBill.objects.get(tenant=tenant)
+        self.content = bytes(range(256)) * (CHUNK_SIZE // 128 + 1)
+        self.bill.bill_file.save('bill.pdf', ContentFile(self.content))
+        self.user = tenant.user
+        self.addCleanup(self.bill.bill_file.delete, save=False)
+
+    async def download(self, headers=None):
+        request = AsyncRequestFactory().get('/', headers=headers)
+        request.user = self.user
+        response = await async_views.download_bill(request, self.bill.id)
+        self.assertTrue(response.is_async)
+        return response, b''.join([chunk async for chunk in response])
+
+    async def test_streams_whole_file(self):
+        response, body = await self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.content)
+
+    async def test_streams_range(self):
+        response, body = await self.download({'Range': f'bytes=100-{CHUNK_SIZE + 99}'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.content[100:CHUNK_SIZE + 100])
@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from rent_app import exchange_rates, system_settings
+from rent_app.exchange_rates import clear_cache, get_rate, parse_bnr_xml, refresh_rates
+from rent_app.models import ExchangeRate, SystemSettings
+
+FEED = Path(__file__).parent / 'fixtures' / 'nbrfxrates.xml'
+
+
+class ParseBnrXmlTests(TestCase):
+    def test_rates_per_day(self):
+        self.assertEqual(parse_bnr_xml(FEED.read_bytes()), [
+            (date(2024, 3, 4), Decimal('4.9703')),
+            (date(2024, 3, 5), Decimal('4.9712')),
+        ])
+
+    def test_multiplier(self):
+        self.assertEqual(parse_bnr_xml(FEED.read_bytes(), currency='HUF'), [
+            (date(2024, 3, 4), Decimal('0.0126')),
+            (date(2024, 3, 5), Decimal('0.0126')),
+        ])
+
+
+@override_settings(EXCHANGE_RATE_CACHE_TTL=3600)
+class GetRateTests(TestCase):
+    def setUp(self):
+        clear_cache()
+        self.addCleanup(clear_cache)
+        system_settings._state = None
+        self.addCleanup(setattr, system_settings, '_state', None)
+
+    def test_refresh_from_file(self):
+        rates = refresh_rates(FEED.as_uri())
+
+        self.assertEqual(len(rates), 2)
+        self.assertEqual(
+            list(ExchangeRate.objects.order_by('date').values_list('date', 'rate', 'source')),
+            [(date(2024, 3, 4), Decimal('4.9703'), FEED.as_uri()), (date(2024, 3, 5), Decimal('4.9712'), FEED.as_uri())],
+        )
+        self.assertEqual(get_rate(date(2024, 3, 5)), Decimal('4.9712'))
+
+    def test_falls_back_to_last_known_then_default(self):
+        SystemSettings.objects.create(key='default_exchange_rate', value='4.95')
+        ExchangeRate.objects.create(date=date(2024, 3, 4), rate=Decimal('4.9703'))
+
+        # Weekends and holidays have no rate of their own
+        self.assertEqual(get_rate(date(2024, 3, 9)), Decimal('4.9703'))
+        with self.assertLogs('rent_app.exchange_rates', 'WARNING'):
+            self.assertEqual(get_rate(date(2024, 3, 1)), Decimal('4.95'))
+
+    def test_ttl(self):
+        day = date(2024, 3, 4)
+        ExchangeRate.objects.create(date=day, rate=Decimal('4.9703'))
+        with mock.patch('rent_app.exchange_rates.time.monotonic', return_value=1000):
+            get_rate(day)
+        ExchangeRate.objects.filter(date=day).update(rate=Decimal('5.0000'))
+
+        with mock.patch('rent_app.exchange_rates.time.monotonic', return_value=4599), self.assertNumQueries(0):
+            self.assertEqual(get_rate(day), Decimal('4.9703'))
+        with mock.patch('rent_app.exchange_rates.time.monotonic', return_value=4601):
+            self.assertEqual(get_rate(day), Decimal('5.0000'))
+
+    def test_evicts_beyond_max_cached_days(self):
+        ExchangeRate.objects.create(date=date(2024, 1, 1), rate=Decimal('4.9703'))
+        days = [date(2024, 1, 1) + timedelta(days=offset) for offset in range(exchange_rates.MAX_CACHED_DAYS + 10)]
+        for number, day in enumerate(days):
+            with mock.patch('rent_app.exchange_rates.time.monotonic', return_value=1000 + number):
+                get_rate(day)
+
+        # The oldest loads go first when every entry is still live
+        self.assertEqual(list(exchange_rates._cache), days[10:])
+
+        # Expired entries go before live ones
+        with mock.patch('rent_app.exchange_rates.time.monotonic', return_value=1000 + 3600 + 20):
+            get_rate(date(2025, 1, 1))
+        self.assertEqual(list(exchange_rates._cache), days[21:] + [date(2025, 1, 1)])
@@ -0,0 +1,54 @@
+from datetime import date
+
+from django.db import connection
+from django.db.models import OuterRef, Subquery
+from django.test import TestCase
+
+from rent_app.bills import OPEN_STATUSES
+from rent_app.models import MeterReading, RentPayment, UtilityBill
+
+from .utils import create_tenant
+
+
+class IndexUsageTests(TestCase):
+    """The hot queries are planned on the indexes added for them"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant('tenant', rows=5)
+        create_tenant('other', rows=5)
+
+    def assert_uses(self, queryset, index):
+        if connection.vendor == 'postgresql':
+            # The test tables are tiny, so PostgreSQL would rather scan them
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        self.assertIn(index, queryset.explain())
+
+    def test_tenant_bills(self):
+        bills = UtilityBill.objects.filter(tenant=self.tenant)
+        self.assert_uses(bills.filter(status__in=OPEN_STATUSES).order_by('due_date', 'id'), 'utilitybill_tenant_status_idx')
+        self.assert_uses(bills.order_by().values('status'), 'utilitybill_tenant_status_idx')
+
+    def test_latest_readings(self):
+        # The query of rent_app.views._latest_readings
+        latest_reading_id = MeterReading.objects.filter(
+            tenant=self.tenant, meter_type=OuterRef('meter_type')
+        ).order_by('-reading_date').values('id')[:1]
+        readings = MeterReading.objects.filter(tenant=self.tenant, id=Subquery(latest_reading_id))
+        self.assert_uses(readings, 'meterreading_latest_idx')
+
+    def test_recent_readings(self):
+        readings = MeterReading.objects.filter(tenant=self.tenant).order_by('-reading_date')[:3]
+        self.assert_uses(readings, 'meterreading_recent_idx')
+
+    def test_overdue(self):
+        today = date(2024, 6, 1)
+        self.assert_uses(
+            UtilityBill.objects.filter(status='unpaid', due_date__lt=today).order_by('pk').values_list('pk', 'tenant_id'),
+            'utilitybill_status_due_idx',
+        )
+        self.assert_uses(
+            RentPayment.objects.filter(status='pending', due_date__lt=today).order_by('pk').values_list('pk'),
+            'rentpayment_status_due_idx',
+        )
@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+
+from rent_app.models import MeterReading, MeterType
+from rent_app.reading_periods import clear_calendar
+
+from .utils import create_tenant
+
+
+class MeterReadingsQueryCountTests(TestCase):
+    def setUp(self):
+        self.tenant = create_tenant('tenant', rows=24)
+        self.client.force_login(self.tenant.user)
+        clear_calendar()
+        self.addCleanup(clear_calendar)
+
+    def add_meter_types(self, count):
+        for number in range(count):
+            meter_type = MeterType.objects.create(
+                name=f'Meter {number}', unit='m3', reading_day_start=20, reading_day_end=10
+            )
+            MeterReading.objects.bulk_create(
+                MeterReading(
+                    meter_type=meter_type, tenant=self.tenant, reading_value=Decimal(index),
+                    reading_date=date(2024, 1, 1) + timedelta(days=31 * index),
+                )
+                for index in range(24)
+            )
+
+    def get_page(self):
+        # Warm the reading period calendar, which is shared by every request
+        self.client.get('/meters/')
+        # Session, user, tenant, latest readings and meter types
+        with self.assertNumQueries(5):
+            response = self.client.get('/meters/')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_constant_query_count(self):
+        response = self.get_page()
+        self.assertEqual(len(response.context['meter_data']), 1)
+
+        self.add_meter_types(10)
+        clear_calendar()
+        response = self.get_page()
+
+        meter_data = response.context['meter_data']
+        self.assertEqual(len(meter_data), 11)
+        latest = {meter['meter_type'].name: meter['latest_reading'].reading_value for meter in meter_data}
+        self.assertEqual(latest.pop('Electricity'), Decimal('123'))
+        self.assertEqual(set(latest.values()), {Decimal('23')})
@@ -0,0 +1,109 @@
+import re
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+
+from rent_app.metrics import DURATION_BUCKETS, MetricsRegistry, _empty_stats, render_prometheus, sql_wrapper
+from rent_app.middleware import PerformanceMiddleware
+
+SERVER_TIMING = re.compile(
+    r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="(\d+) queries", tpl;dur=[\d.]+$'
+)
+
+
+@override_settings(PERF_SLOW_REQUEST_MS=60000, PERF_METRICS_PUBLISH_INTERVAL=15)
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        patcher = mock.patch('rent_app.middleware.registry', self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_server_timing_counts_queries(self):
+        def view(request):
+            User.objects.count()
+            User.objects.exists()
+            return HttpResponse('ok')
+
+        with connection.execute_wrapper(sql_wrapper):
+            response = PerformanceMiddleware(view)(RequestFactory().get('/'))
+            # Queries outside a request aren't counted
+            User.objects.count()
+
+        self.assertEqual(SERVER_TIMING.match(response['Server-Timing']).group(1), '2')
+        stats = self.registry.snapshot()['unresolved']
+        self.assertEqual((stats['requests'], stats['queries'], stats['bytes']), (1, 2, 2))
+
+    async def test_async_publish_runs_off_the_event_loop(self):
+        async def view(request):
+            return HttpResponse('ok')
+
+        threads = []
+        with mock.patch.object(self.registry, 'publish', side_effect=lambda: threads.append(threading.get_ident())):
+            middleware = PerformanceMiddleware(view)
+            response = await middleware(AsyncRequestFactory().get('/'))
+            # Published at most once per interval
+            await middleware(AsyncRequestFactory().get('/'))
+
+        self.assertRegex(response['Server-Timing'], SERVER_TIMING)
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+
+class RenderPrometheusTests(TestCase):
+    def test_text_format(self):
+        stats = _empty_stats()
+        stats.update(requests=3, duration=0.5, queries=12, bytes=2048)
+        stats['buckets'][0] = 2
+        stats['buckets'][DURATION_BUCKETS.index(0.25)] = 1
+
+        lines = render_prometheus({'dashboard': stats}).splitlines()
+
+        self.assertIn('# TYPE rentmanager_requests_total counter', lines)
+        self.assertIn('rentmanager_requests_total{view="dashboard"} 3', lines)
+        self.assertIn('rentmanager_db_queries_total{view="dashboard"} 12', lines)
+        self.assertIn('rentmanager_response_bytes_total{view="dashboard"} 2048', lines)
+        self.assertIn('# TYPE rentmanager_request_duration_seconds histogram', lines)
+        # Buckets are cumulative
+        self.assertIn('rentmanager_request_duration_seconds_bucket{view="dashboard",le="0.01"} 2', lines)
+        self.assertIn('rentmanager_request_duration_seconds_bucket{view="dashboard",le="0.1"} 2', lines)
+        self.assertIn('rentmanager_request_duration_seconds_bucket{view="dashboard",le="0.25"} 3', lines)
+        self.assertIn('rentmanager_request_duration_seconds_bucket{view="dashboard",le="+Inf"} 3', lines)
+        self.assertIn('rentmanager_request_duration_seconds_sum{view="dashboard"} 0.500000', lines)
+
+    def test_escapes_labels(self):
+        output = render_prometheus({'a"b\\c': _empty_stats()})
+        self.assertIn('rentmanager_requests_total{view="a\\"b\\\\c"} 0', output)
+
+
+@override_settings(PERF_METRICS=True, PERF_METRICS_TOKEN='secret')
+class MetricsViewTests(TestCase):
+    def test_disabled(self):
+        with self.settings(PERF_METRICS=False):
+            self.assertEqual(self.client.get('/metrics/').status_code, 404)
+
+    def test_requires_token_or_staff(self):
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        self.assertEqual(self.client.get('/metrics/', headers={'Authorization': 'Bearer wrong'}).status_code, 403)
+
+        User.objects.create_user('tenant', password='pass')
+        self.client.login(username='tenant', password='pass')
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+
+    def test_token(self):
+        response = self.client.get('/metrics/', headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+
+    def test_no_token_configured(self):
+        with self.settings(PERF_METRICS_TOKEN=''):
+            self.assertEqual(self.client.get('/metrics/', headers={'Authorization': 'Bearer '}).status_code, 403)
+
+    def test_staff(self):
+        User.objects.create_user('admin', password='pass', is_staff=True)
+        self.client.login(username='admin', password='pass')
+        self.assertEqual(self.client.get('/metrics/').status_code, 200)
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from rent_app import system_settings
+from rent_app.models import NotificationEvent, SystemSettings
+from rent_app.notifications import flush_admin_digest, notify_admins
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', ADMIN_DIGEST_RETENTION_DAYS=30)
+class AdminDigestTests(TestCase):
+    def setUp(self):
+        SystemSettings.objects.create(key='admin_notification_mode', value='digest')
+        SystemSettings.objects.create(key='admin_digest_window_minutes', value='60')
+        SystemSettings.objects.create(key='admin_digest_max_events', value='2')
+        system_settings._state = None
+        self.addCleanup(setattr, system_settings, '_state', None)
+
+    def age(self, minutes):
+        NotificationEvent.objects.update(created_at=timezone.now() - timedelta(minutes=minutes))
+
+    def test_waits_for_the_window(self):
+        notify_admins('Bill paid', 'first')
+
+        self.assertEqual(flush_admin_digest(), 0)
+        self.age(61)
+        self.assertEqual(flush_admin_digest(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(NotificationEvent.objects.filter(sent_at__isnull=True).exists())
+
+    def test_size_limit_flushes_without_waiting(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_admins('Bill paid', 'first')
+        self.assertEqual(len(mail.outbox), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_admins('Bill paid', 'second')
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('first', mail.outbox[0].body)
+        self.assertIn('second', mail.outbox[0].body)
+
+    def test_one_email_per_max_events(self):
+        for number in range(5):
+            NotificationEvent.objects.create(subject='Bill paid', message=str(number))
+
+        self.assertEqual(flush_admin_digest(force=True), 5)
+        self.assertEqual([message.subject for message in mail.outbox], [
+            'Rent Manager digest - 2 notification(s)',
+            'Rent Manager digest - 2 notification(s)',
+            'Rent Manager digest - 1 notification(s)',
+        ])
+
+    def test_skips_rows_claimed_by_another_flush(self):
+        NotificationEvent.objects.create(subject='Claimed', message='', batch='other')
+        NotificationEvent.objects.create(subject='Pending', message='')
+
+        self.assertEqual(flush_admin_digest(force=True), 1)
+        self.assertNotIn('Claimed', mail.outbox[0].body)
+        self.assertIsNone(NotificationEvent.objects.get(subject='Claimed').sent_at)
+
+    def test_failure_releases_only_unsent_events(self):
+        for number in range(4):
+            NotificationEvent.objects.create(subject=f'Event {number}', message='')
+        send = mail.get_connection().send_messages
+        calls = []
+
+        def flaky(messages):
+            calls.append(messages)
+            if len(calls) == 2:
+                raise SMTPException('connection lost')
+            return send(messages)
+
+        with mock.patch.object(mail.backends.locmem.EmailBackend, 'send_messages', side_effect=flaky):
+            with self.assertRaises(SMTPException):
+                flush_admin_digest(force=True)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(
+            sorted(NotificationEvent.objects.filter(batch='').values_list('subject', flat=True)),
+            ['Event 2', 'Event 3'],
+        )
+
+        # The retry sends the remaining events only
+        self.assertEqual(flush_admin_digest(force=True), 2)
+        self.assertNotIn('Event 0', mail.outbox[1].body)
+        self.assertIn('Event 2', mail.outbox[1].body)
+
+    def test_prunes_old_sent_events(self):
+        now = timezone.now()
+        NotificationEvent.objects.create(subject='Old', message='', batch='done', sent_at=now - timedelta(days=31))
+        NotificationEvent.objects.create(subject='Recent', message='', batch='done', sent_at=now - timedelta(days=29))
+        NotificationEvent.objects.create(subject='Pending', message='')
+
+        flush_admin_digest()
+        self.assertEqual(
+            sorted(NotificationEvent.objects.values_list('subject', flat=True)), ['Pending', 'Recent']
+        )
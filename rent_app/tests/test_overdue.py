@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from rent_app.caching import get_dashboard_context, invalidate_dashboards, set_dashboard_context
+from rent_app.models import RentPayment, UtilityBill, UtilityType
+from rent_app.overdue import reconcile_overdue
+
+from .utils import create_tenant
+
+TODAY = date(2024, 6, 1)
+
+
+class ReconcileOverdueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.late = create_tenant('late', rows=0)
+        self.on_time = create_tenant('on_time', rows=0)
+        self.utility_type = UtilityType.objects.get()
+
+    def bill(self, tenant, due_date, status):
+        return UtilityBill.objects.create(
+            utility_type=self.utility_type, tenant=tenant, amount=Decimal('10'), due_date=due_date, status=status
+        )
+
+    def payment(self, tenant, due_date, status):
+        return RentPayment.objects.create(
+            agreement=tenant.rentagreement, amount_eur=Decimal('500'), amount_ron=Decimal('2500'),
+            exchange_rate=Decimal('5'), due_date=due_date, status=status,
+        )
+
+    def test_marks_past_due_rows_in_batches(self):
+        past_due = [self.bill(self.late, TODAY - timedelta(days=day), 'unpaid') for day in range(1, 6)]
+        untouched_bills = [
+            self.bill(self.late, TODAY - timedelta(days=10), 'paid'),
+            self.bill(self.on_time, TODAY, 'unpaid'),
+            self.bill(self.on_time, TODAY + timedelta(days=3), 'unpaid'),
+        ]
+        late_payments = [self.payment(self.late, date(2024, month, 1), 'pending') for month in (4, 5)]
+        untouched_payments = [
+            self.payment(self.late, date(2024, 3, 1), 'paid'),
+            self.payment(self.on_time, TODAY, 'pending'),
+        ]
+        for tenant in (self.late, self.on_time):
+            set_dashboard_context(tenant.user_id, {'cached': True})
+
+        with mock.patch('rent_app.overdue.invalidate_dashboards', wraps=invalidate_dashboards) as invalidate:
+            result = reconcile_overdue(today=TODAY, batch_size=2)
+
+        self.assertEqual((result['bills'], result['payments']), (5, 2))
+        # Batches of two: three for the bills, one for the payments
+        self.assertEqual(invalidate.call_count, 4)
+        self.assertEqual(
+            set(UtilityBill.objects.filter(status='overdue').values_list('pk', flat=True)),
+            {bill.pk for bill in past_due},
+        )
+        self.assertEqual(
+            [UtilityBill.objects.get(pk=bill.pk).status for bill in untouched_bills], ['paid', 'unpaid', 'unpaid']
+        )
+        self.assertEqual(
+            set(RentPayment.objects.filter(status='overdue').values_list('pk', flat=True)),
+            {payment.pk for payment in late_payments},
+        )
+        self.assertEqual(
+            [RentPayment.objects.get(pk=payment.pk).status for payment in untouched_payments], ['paid', 'pending']
+        )
+        self.assertIsNone(get_dashboard_context(self.late.user_id))
+        self.assertIsNotNone(get_dashboard_context(self.on_time.user_id))
+
+        # Nothing left to do on a second run
+        self.assertEqual(reconcile_overdue(today=TODAY)['bills'], 0)
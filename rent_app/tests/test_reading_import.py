@@ -0,0 +1,118 @@
+import io
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from rent_app.models import MeterReading
+from rent_app.reading_import import import_readings, iter_json, parse_rows
+
+from .utils import create_tenant
+
+URL = '/meters/import/'
+
+
+def rows(count, tenant='tenant', start=date(2024, 1, 1)):
+    return [
+        {'tenant': tenant, 'meter_type': 'Electricity', 'reading_value': f'{100 + index}.50',
+         'reading_date': (start + timedelta(days=index)).isoformat(), 'notes': f'row {index}'}
+        for index in range(count)
+    ]
+
+
+def as_csv(data):
+    header = 'tenant,meter_type,reading_value,reading_date,notes\n'
+    return header + ''.join(f"{row['tenant']},{row['meter_type']},{row['reading_value']},{row['reading_date']},{row['notes']}\n" for row in data)
+
+
+class ParseRowsTests(TestCase):
+    def test_formats_across_read_boundaries(self):
+        data = rows(50)
+        expected = [{**row, 'reading_value': Decimal(row['reading_value'])} for row in data]
+        inputs = {
+            'csv': as_csv(data),
+            'json': json.dumps([{**row, 'reading_value': float(row['reading_value'])} for row in data], indent=1),
+            'jsonl': ''.join(json.dumps({**row, 'reading_value': float(row['reading_value'])}) + '\n' for row in data),
+        }
+        # Every object straddles several reads
+        with mock.patch('rent_app.reading_import.READ_SIZE', 7):
+            for fmt, text in inputs.items():
+                with self.subTest(fmt):
+                    parsed = list(parse_rows(io.StringIO(text), 'csv' if fmt == 'csv' else 'json'))
+                    if fmt == 'csv':
+                        parsed = [{**row, 'reading_value': Decimal(row['reading_value'])} for row in parsed]
+                    self.assertEqual(parsed, expected)
+
+    def test_truncated_json(self):
+        with mock.patch('rent_app.reading_import.READ_SIZE', 7), self.assertRaises(ValueError):
+            list(iter_json(io.StringIO('[{"tenant": "a"}, {"tenant": ')))
+
+
+class ImportReadingsTests(TestCase):
+    def setUp(self):
+        self.tenant = create_tenant('tenant', rows=1)  # Electricity 100.00 on 2024-01-01
+
+    def test_rejects_lower_values_and_duplicate_dates(self):
+        report = import_readings([
+            {'tenant': 'tenant', 'meter_type': 'Electricity', 'reading_value': '150', 'reading_date': '2024-02-01'},
+            {'tenant': 'tenant', 'meter_type': 'Electricity', 'reading_value': '140', 'reading_date': '2024-03-01'},
+            {'tenant': 'tenant', 'meter_type': 'Electricity', 'reading_value': '160', 'reading_date': '2024-02-01'},
+            {'tenant': 'tenant', 'meter_type': 'Electricity', 'reading_value': '170', 'reading_date': '2024-01-15'},
+            {'tenant': 'nobody', 'meter_type': 'Electricity', 'reading_value': '1', 'reading_date': '2024-02-01'},
+            {'tenant': 'tenant', 'meter_type': 'Electricity', 'reading_value': '180', 'reading_date': '2024-04-01'},
+        ]).as_dict()
+
+        self.assertEqual((report['created'], report['rejected']), (2, 4))
+        self.assertEqual([error['row'] for error in report['errors']], [2, 3, 4, 5])
+        self.assertIn('lower than the previous reading (150.00)', report['errors'][0]['error'])
+        self.assertIn('already exists', report['errors'][1]['error'])
+        self.assertIn('before the latest reading', report['errors'][2]['error'])
+        self.assertEqual(
+            list(MeterReading.objects.order_by('reading_date').values_list('reading_value', flat=True)),
+            [Decimal('100.00'), Decimal('150.00'), Decimal('180.00')],
+        )
+
+    def test_chunked_writes(self):
+        with mock.patch('rent_app.reading_import.CHUNK_SIZE', 10):
+            report = import_readings(rows(35, start=date(2024, 2, 1)))
+        self.assertEqual(report.created, 35)
+        self.assertEqual(MeterReading.objects.count(), 36)
+
+
+class ImportEndpointTests(TestCase):
+    def setUp(self):
+        self.tenant = create_tenant('tenant', rows=0)
+        self.staff = User.objects.create_user('staff', password='pass', is_staff=True)
+
+    def test_csv_upload(self):
+        self.client.force_login(self.staff)
+        # Larger than one read
+        upload = SimpleUploadedFile('readings.csv', as_csv(rows(2000)).encode(), content_type='text/csv')
+        response = self.client.post(URL, {'file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'created': 2000, 'rejected': 0, 'errors': []})
+
+    def test_json_lines_body(self):
+        self.client.force_login(self.staff)
+        body = ''.join(json.dumps(row) + '\n' for row in rows(3))
+        response = self.client.post(URL + '?format=json', body, content_type='application/x-ndjson')
+        self.assertEqual(response.json()['created'], 3)
+
+    def test_malformed_upload_imports_nothing(self):
+        self.client.force_login(self.staff)
+        body = json.dumps(rows(30))[:-1] + ', {"tenant": '
+        with mock.patch('rent_app.reading_import.CHUNK_SIZE', 10):
+            response = self.client.post(URL, body, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Could not parse JSON input', response.json()['error'])
+        self.assertFalse(MeterReading.objects.exists())
+
+    def test_staff_only(self):
+        self.client.force_login(self.tenant.user)
+        response = self.client.post(URL, as_csv(rows(1)), content_type='text/csv')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(MeterReading.objects.exists())
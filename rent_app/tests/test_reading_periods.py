@@ -0,0 +1,84 @@
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from rent_app.models import MeterReading, MeterType
+from rent_app.reading_periods import ReadingCalendar, ReadingPeriod, build_periods, clear_calendar
+
+from .utils import create_tenant
+
+
+class BuildPeriodsTests(SimpleTestCase):
+    def test_wraps_across_the_year(self):
+        self.assertEqual(build_periods(25, 5, date(2024, 12, 1), months=3), [
+            ReadingPeriod(date(2024, 12, 25), date(2025, 1, 5)),
+            ReadingPeriod(date(2025, 1, 25), date(2025, 2, 5)),
+            ReadingPeriod(date(2025, 2, 25), date(2025, 3, 5)),
+        ])
+
+    def test_short_months(self):
+        self.assertEqual(build_periods(30, 3, date(2024, 1, 1), months=3), [
+            ReadingPeriod(date(2024, 1, 30), date(2024, 2, 3)),
+            ReadingPeriod(date(2024, 2, 29), date(2024, 3, 3)),
+            ReadingPeriod(date(2024, 3, 30), date(2024, 4, 3)),
+        ])
+        self.assertEqual(build_periods(28, 31, date(2025, 2, 1), months=1), [
+            ReadingPeriod(date(2025, 2, 28), date(2025, 2, 28)),
+        ])
+
+    def test_within_the_month(self):
+        self.assertEqual(build_periods(1, 10, date(2025, 2, 1), months=1), [
+            ReadingPeriod(date(2025, 2, 1), date(2025, 2, 10)),
+        ])
+
+
+class ReadingCalendarTests(SimpleTestCase):
+    def setUp(self):
+        # 1: 25-5 wrapping, 2: 10-15
+        self.calendar = ReadingCalendar([(1, 25, 5), (2, 10, 15)], date(2025, 1, 3))
+
+    def test_open_across_new_year(self):
+        period = ReadingPeriod(date(2024, 12, 25), date(2025, 1, 5))
+        for day in (date(2024, 12, 25), date(2024, 12, 31), date(2025, 1, 1), date(2025, 1, 5)):
+            with self.subTest(day=day):
+                self.assertEqual(self.calendar.current_period(1, day), period)
+        self.assertIsNone(self.calendar.current_period(1, date(2025, 1, 6)))
+        self.assertEqual(self.calendar.current_period(1).days_left(self.calendar.today), 2)
+
+    def test_february(self):
+        self.assertTrue(self.calendar.is_open(1, date(2025, 2, 28)))
+        self.assertTrue(self.calendar.is_open(1, date(2025, 3, 5)))
+        self.assertFalse(self.calendar.is_open(1, date(2025, 2, 24)))
+        self.assertEqual(
+            self.calendar.next_period(1, date(2025, 2, 10)), ReadingPeriod(date(2025, 2, 25), date(2025, 3, 5))
+        )
+
+    def test_open_meter_types(self):
+        self.assertEqual(self.calendar.open_meter_types(), [1])
+        self.assertEqual(self.calendar.open_meter_types(date(2025, 1, 12)), [2])
+        self.assertEqual(self.calendar.open_meter_types(date(2025, 1, 20)), [])
+
+
+class LocalDateTests(TestCase):
+    """Near midnight the Bucharest date is a day ahead of UTC"""
+
+    def setUp(self):
+        clear_calendar()
+        self.addCleanup(clear_calendar)
+        self.tenant = create_tenant('tenant', rows=0)
+        self.meter_type = MeterType.objects.create(name='Gas', unit='m3', reading_day_start=1, reading_day_end=5)
+        self.client.force_login(self.tenant.user)
+
+    def test_period_opens_at_local_midnight(self):
+        # 00:30 on January 1st in Bucharest
+        now = datetime(2024, 12, 31, 22, 30, tzinfo=dt_timezone.utc)
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            response = self.client.get('/meters/')
+            self.assertIn(self.meter_type, response.context['meters_in_period'])
+            self.assertEqual(response.context['current_date'], date(2025, 1, 1))
+
+            self.client.post('/meters/submit/', {'meter_type': self.meter_type.pk, 'reading_value': '12.5'})
+
+        reading = MeterReading.objects.get(meter_type=self.meter_type)
+        self.assertEqual(reading.reading_date, date(2025, 1, 1))
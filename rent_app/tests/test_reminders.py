@@ -0,0 +1,48 @@
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+
+from rent_app.dates import add_months
+from rent_app.models import ReadingReminder
+from rent_app.reading_periods import clear_calendar
+from rent_app.reminders import send_reading_reminders
+
+from .utils import create_tenant
+
+
+class ReadingReminderTests(TestCase):
+    def setUp(self):
+        for username in ('first', 'second', 'third'):
+            user = create_tenant(username, rows=0).user
+            user.email = f'{username}@example.com'
+            user.save()
+        clear_calendar()
+        # Electricity's 25-5 period closes the next day
+        self.day = add_months(timezone.localdate(), 1).replace(day=4)
+
+    def test_failure_forgets_only_undelivered_reminders(self):
+        send = mail.get_connection().send_messages
+        calls = []
+
+        def flaky(messages):
+            calls.append(messages[0].to)
+            if len(calls) == 2:
+                raise SMTPException('connection lost')
+            return send(messages)
+
+        with mock.patch.object(mail.backends.locmem.EmailBackend, 'send_messages', side_effect=flaky):
+            with self.assertRaises(SMTPException):
+                send_reading_reminders(self.day)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(
+            list(ReadingReminder.objects.values_list('tenant__user__username', flat=True)), ['first']
+        )
+
+        # The retry reaches the remaining tenants only
+        self.assertEqual(send_reading_reminders(self.day), 2)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox[1:]), ['second@example.com', 'third@example.com']
+        )
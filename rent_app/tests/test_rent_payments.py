@@ -0,0 +1,51 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+
+from rent_app.models import ExchangeRate, RentAgreement, RentPayment
+from rent_app import rent_payments
+from rent_app.rent_payments import generate_rent_payments
+
+from .utils import create_tenant
+
+
+class GenerateRentPaymentsTests(TestCase):
+    def setUp(self):
+        ExchangeRate.objects.create(date=date(2020, 1, 1), rate=Decimal('5'))
+        self.agreement = create_tenant('tenant', rows=0).rentagreement
+
+    def test_creates_one_payment_per_month(self):
+        self.assertEqual(generate_rent_payments(date(2025, 1, 1), date(2025, 3, 1)), 3)
+        self.assertEqual(generate_rent_payments(date(2025, 1, 1), date(2025, 3, 1)), 0)
+
+    def test_skips_months_with_a_payment_on_another_day(self):
+        RentPayment.objects.create(
+            agreement=self.agreement, amount_eur=Decimal('500'), amount_ron=Decimal('2500'),
+            exchange_rate=Decimal('5'), due_date=date(2025, 2, 15),
+        )
+        self.assertEqual(generate_rent_payments(date(2025, 1, 1), date(2025, 3, 1)), 2)
+        self.assertEqual(RentPayment.objects.filter(due_date__month=2).count(), 1)
+
+    def test_backfills_agreements_that_have_ended(self):
+        RentAgreement.objects.filter(pk=self.agreement.pk).update(is_active=False, end_date=date(2025, 2, 10))
+        deactivated = create_tenant('deactivated', rows=0).rentagreement
+        RentAgreement.objects.filter(pk=deactivated.pk).update(is_active=False)
+
+        self.assertEqual(generate_rent_payments(date(2025, 1, 1), date(2025, 4, 1)), 2)
+        self.assertEqual(
+            list(RentPayment.objects.order_by('due_date').values_list('agreement_id', 'due_date')),
+            [(self.agreement.pk, date(2025, 1, 1)), (self.agreement.pk, date(2025, 2, 1))],
+        )
+
+    def test_counts_only_inserted_payments(self):
+        other = create_tenant('other', rows=0).rentagreement
+        # Inserted by a concurrent run after this one looked for existing payments
+        RentPayment.objects.create(
+            agreement=other, amount_eur=Decimal('500'), amount_ron=Decimal('2500'),
+            exchange_rate=Decimal('5'), due_date=date(2025, 1, 1),
+        )
+        with mock.patch.object(rent_payments, '_agreements_paying', side_effect=[set(), {other.pk}]):
+            self.assertEqual(generate_rent_payments(date(2025, 1, 1)), 1)
+        self.assertEqual(RentPayment.objects.count(), 2)
@@ -0,0 +1,39 @@
+import tempfile
+from pathlib import Path
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.test import SimpleTestCase, override_settings
+
+ALIAS = 'tuning_test'
+
+
+@override_settings(SQLITE_TUNING=True, SQLITE_BUSY_TIMEOUT=1234, SQLITE_MMAP_SIZE=1048576, SQLITE_CACHE_SIZE=-4000)
+class ConnectionCreatedTests(SimpleTestCase):
+    def setUp(self):
+        # What apps.ready() connects when SQLITE_TUNING is on
+        apps.get_app_config('rent_app').ready()
+        self.addCleanup(connection_created.disconnect, dispatch_uid='rent_app_sqlite_tuning')
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        configured = connections.configure_settings({
+            DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+            ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(Path(directory.name) / 'db.sqlite3')},
+        })
+        connections.settings[ALIAS] = configured[ALIAS]
+        self.addCleanup(self.remove_database)
+
+    def remove_database(self):
+        connections[ALIAS].close()
+        del connections[ALIAS]
+        del connections.settings[ALIAS]
+
+    def test_pragmas_applied_to_new_connections(self):
+        expected = {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 1234, 'mmap_size': 1048576, 'cache_size': -4000}
+        with connections[ALIAS].cursor() as cursor:
+            for name, value in expected.items():
+                with self.subTest(name):
+                    cursor.execute(f'PRAGMA {name}')
+                    self.assertEqual(cursor.fetchone()[0], value)
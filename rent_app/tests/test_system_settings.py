@@ -0,0 +1,35 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from rent_app import system_settings
+from rent_app.models import SystemSettings
+from rent_app.system_settings import get_setting
+
+
+@override_settings(SYSTEM_SETTINGS_CHECK_INTERVAL=5, SYSTEM_SETTINGS_MAX_AGE=60)
+class GetSettingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        system_settings._state = None
+        self.addCleanup(setattr, system_settings, '_state', None)
+        SystemSettings.objects.create(key='rent_due_day', value='5')
+
+    def get_at(self, now):
+        with mock.patch('rent_app.system_settings.time.monotonic', return_value=now):
+            return get_setting('rent_due_day')
+
+    def test_reloads_after_max_age_without_version_change(self):
+        self.assertEqual(self.get_at(1000), 5)
+        # Saved by another process whose version stamp this one can't see
+        SystemSettings.objects.filter(key='rent_due_day').update(value='10')
+        self.assertEqual(self.get_at(1030), 5)
+        self.assertEqual(self.get_at(1061), 10)
+
+    def test_reloads_when_version_changes(self):
+        self.assertEqual(self.get_at(1000), 5)
+        SystemSettings.objects.filter(key='rent_due_day').update(value='10')
+        cache.set(system_settings.VERSION_KEY, 'changed', None)
+        self.assertEqual(self.get_at(1004), 5)
+        self.assertEqual(self.get_at(1006), 10)
@@ -0,0 +1,20 @@
+import smtplib
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from rent_app import tasks
+
+
+@override_settings(
+    CELERY_TASK_ALWAYS_EAGER=True,
+    EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+    EMAIL_HOST='127.0.0.1',
+    EMAIL_PORT=1,
+)
+class EagerEmailTests(SimpleTestCase):
+    def test_one_silent_attempt_without_a_broker(self):
+        with mock.patch.object(smtplib, 'SMTP', side_effect=ConnectionRefusedError) as smtp:
+            result = tasks.send_email.delay('Subject', 'Body', ['admin@example.com'])
+        self.assertEqual(result.get(), 0)
+        self.assertEqual(smtp.call_count, 1)
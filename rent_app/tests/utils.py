@@ -0,0 +1,32 @@
+"""Row builders shared by the tests"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+
+from rent_app.models import MeterReading, MeterType, RentAgreement, RentPayment, Tenant, UtilityBill, UtilityType
+
+
+def create_tenant(username, rows=1):
+    """A tenant with an agreement and ``rows`` payments, bills and readings per meter"""
+    user = User.objects.create_user(username, password='pass')
+    tenant = Tenant.objects.create(user=user)
+    agreement = RentAgreement.objects.create(tenant=tenant, monthly_rent_eur=Decimal('500'), start_date=date(2020, 1, 1))
+    utility_type, _ = UtilityType.objects.get_or_create(name='Electricity')
+    meter_type, _ = MeterType.objects.get_or_create(
+        name='Electricity', defaults={'unit': 'kWh', 'reading_day_start': 25, 'reading_day_end': 5}
+    )
+    for index in range(rows):
+        day = date(2024, 1, 1) + timedelta(days=31 * index)
+        RentPayment.objects.create(
+            agreement=agreement, amount_eur=Decimal('500'), amount_ron=Decimal('2500'),
+            exchange_rate=Decimal('5'), due_date=day, status='paid' if index % 2 else 'pending',
+        )
+        UtilityBill.objects.create(
+            utility_type=utility_type, tenant=tenant, amount=Decimal('100'), due_date=day,
+            status=['unpaid', 'paid', 'overdue'][index % 3],
+        )
+        MeterReading.objects.create(
+            meter_type=meter_type, tenant=tenant, reading_value=Decimal(100 + index), reading_date=day,
+        )
+    return tenant
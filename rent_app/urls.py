@@ -1,7 +1,13 @@
 from django.urls import path
+from django.conf import settings
 from django.contrib.auth import views as auth_views
 from . import views
 
+# Tenant pages with independent queries have async versions for ASGI deployments
+tenant_views = views
+if settings.ASYNC_VIEWS:
+    from . import async_views as tenant_views
+
 app_name = 'rent_app'
 
 urlpatterns = [
@@ -17,16 +23,22 @@ urlpatterns = [
     ), name='password_change_done'),
 
     # Dashboard
-    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/', tenant_views.dashboard, name='dashboard'),
 
     # Rent management
-    path('rent/', views.rent_status, name='rent_status'),
+    path('rent/', tenant_views.rent_status, name='rent_status'),
+    path('rent/payments/', views.rent_payments_json, name='rent_payments_json'),
 
     # Utility bills
-    path('utilities/', views.utility_bills, name='utility_bills'),
-    path('utilities/<int:bill_id>/download/', views.download_bill, name='download_bill'),
+    path('utilities/', tenant_views.utility_bills, name='utility_bills'),
+    path('utilities/<int:bill_id>/download/', tenant_views.download_bill, name='download_bill'),
 
     # Meter readings
-    path('meters/', views.meter_readings, name='meter_readings'),
+    path('meters/', tenant_views.meter_readings, name='meter_readings'),
     path('meters/submit/', views.submit_meter_reading, name='submit_meter_reading'),
+    path('meters/consumption/', views.meter_consumption, name='meter_consumption'),
+    path('meters/import/', views.import_meter_readings, name='import_meter_readings'),
+
+    # Monitoring
+    path('metrics/', views.metrics, name='metrics'),
 ]
@@ -1,63 +1,88 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.utils import timezone
-from django.core.mail import send_mail
+from django.db.models import OuterRef, Subquery
 from django.conf import settings
+from django.utils.crypto import constant_time_compare
 from datetime import datetime, timedelta
+import codecs
+import csv
 import requests
 
+from .analytics import tenant_consumption_reports
+from .bills import tenant_bill_summary
+from .caching import get_dashboard_context, set_dashboard_context
+from .downloads import file_etag, serve_file
+from .metrics import registry as metrics_registry, render_prometheus
 from .models import (
     Tenant, RentAgreement, RentPayment, UtilityType, UtilityBill,
     MeterType, MeterReading, SystemSettings
 )
+from .notifications import notify_admins
+from .pagination import keyset_page
+from .reading_import import detect_format, import_readings, parse_rows
+from .reading_periods import get_calendar
 
+PAYMENT_HISTORY_PAGE_SIZE = 12
 
-@login_required
-def dashboard(request):
-    """Main dashboard view"""
-    # Check if user is admin (superuser) and redirect to admin interface
-    if request.user.is_superuser:
-        return redirect('/admin/')
-
-    # For regular tenants
-    tenant = get_object_or_404(Tenant, user=request.user)
 
-    # Get recent rent payments
+def _rent_overview(tenant):
+    """Active rent agreement and its 5 most recent payments"""
     rent_agreement = RentAgreement.objects.filter(tenant=tenant, is_active=True).first()
     recent_payments = []
     if rent_agreement:
-        recent_payments = RentPayment.objects.filter(
+        recent_payments = list(RentPayment.objects.filter(
             agreement=rent_agreement
-        ).order_by('-due_date')[:5]
-
-    # Get pending bills count (all unpaid and overdue bills)
-    pending_bills_count = UtilityBill.objects.filter(
-        tenant=tenant,
-        status__in=['unpaid', 'overdue']
-    ).count()
+        ).order_by('-due_date')[:5])
+    return rent_agreement, recent_payments
 
-    # Get bills to pay (unpaid and overdue, ordered by due date)
-    upcoming_bills = UtilityBill.objects.filter(
-        tenant=tenant,
-        status__in=['unpaid', 'overdue']
-    ).order_by('due_date')[:5]
 
-    # Get recent meter readings
-    recent_readings = MeterReading.objects.filter(
+def _recent_readings(tenant):
+    return list(MeterReading.objects.filter(
         tenant=tenant
-    ).order_by('-reading_date')[:3]
+    ).select_related('meter_type').order_by('-reading_date')[:3])
 
-    context = {
+
+def _build_dashboard_context(tenant, rent_overview, bill_summary, recent_readings):
+    rent_agreement, recent_payments = rent_overview
+    return {
         'tenant': tenant,
         'rent_agreement': rent_agreement,
         'recent_payments': recent_payments,
-        'pending_bills_count': pending_bills_count,
-        'upcoming_bills': upcoming_bills,
+        # Bills to pay (unpaid and overdue, ordered by due date)
+        'pending_bills_count': bill_summary['open_count'],
+        'upcoming_bills': bill_summary['open'][:5],
         'recent_readings': recent_readings,
     }
 
+
+def _dashboard_context(tenant):
+    """Build the dashboard context; querysets are evaluated so it can be cached"""
+    return _build_dashboard_context(
+        tenant,
+        _rent_overview(tenant),
+        tenant_bill_summary(tenant, paid_limit=0),
+        _recent_readings(tenant),
+    )
+
+
+@login_required
+def dashboard(request):
+    """Main dashboard view"""
+    # Check if user is admin (superuser) and redirect to admin interface
+    if request.user.is_superuser:
+        return redirect('/admin/')
+
+    # For regular tenants, serve the cached context when available
+    context = get_dashboard_context(request.user.id)
+    if context is None:
+        tenant = get_object_or_404(Tenant, user=request.user)
+        context = _dashboard_context(tenant)
+        set_dashboard_context(request.user.id, context)
+
     return render(request, 'rent_app/dashboard.html', context)
 
 
@@ -71,29 +96,67 @@ def rent_status(request):
     tenant = get_object_or_404(Tenant, user=request.user)
     rent_agreement = get_object_or_404(RentAgreement, tenant=tenant, is_active=True)
 
-    # Get current month payment
-    current_date = timezone.now().date()
+    # Get current month payment (date range so the agreement/due_date index is used)
+    current_date = timezone.localdate()
+    month_start = current_date.replace(day=1)
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
     current_month_payment = RentPayment.objects.filter(
         agreement=rent_agreement,
-        due_date__year=current_date.year,
-        due_date__month=current_date.month
+        due_date__gte=month_start,
+        due_date__lt=next_month_start
     ).first()
 
-    # Get all payments
-    all_payments = RentPayment.objects.filter(
-        agreement=rent_agreement
-    ).order_by('-due_date')
+    # Get one page of the payment history
+    payments, next_cursor = keyset_page(
+        RentPayment.objects.filter(agreement=rent_agreement),
+        request.GET.get('after'),
+        PAYMENT_HISTORY_PAGE_SIZE
+    )
 
     context = {
         'rent_agreement': rent_agreement,
         'current_month_payment': current_month_payment,
-        'all_payments': all_payments,
+        'all_payments': payments,
+        'next_cursor': next_cursor,
+        'is_first_page': 'after' not in request.GET,
         'current_date': current_date,
     }
 
     return render(request, 'rent_app/rent_status.html', context)
 
 
+@login_required
+def rent_payments_json(request):
+    """Payment history page as JSON, for infinite scroll on the rent status page"""
+    if request.user.is_superuser:
+        return JsonResponse({'error': 'Tenants only'}, status=403)
+
+    tenant = get_object_or_404(Tenant, user=request.user)
+    rent_agreement = get_object_or_404(RentAgreement, tenant=tenant, is_active=True)
+
+    payments, next_cursor = keyset_page(
+        RentPayment.objects.filter(agreement=rent_agreement),
+        request.GET.get('after'),
+        PAYMENT_HISTORY_PAGE_SIZE
+    )
+
+    return JsonResponse({
+        'payments': [
+            {
+                'due_date': payment.due_date,
+                'amount_eur': payment.amount_eur,
+                'amount_ron': payment.amount_ron,
+                'exchange_rate': payment.exchange_rate,
+                'payment_date': payment.payment_date,
+                'status': payment.status,
+                'status_display': payment.get_status_display(),
+            }
+            for payment in payments
+        ],
+        'next_cursor': next_cursor,
+    })
+
+
 @login_required
 def utility_bills(request):
     """Utility bills view"""
@@ -103,26 +166,15 @@ def utility_bills(request):
 
     tenant = get_object_or_404(Tenant, user=request.user)
 
-    # Get bills by status
-    unpaid_bills = UtilityBill.objects.filter(
-        tenant=tenant,
-        status='unpaid'
-    ).order_by('due_date')
-
-    paid_bills = UtilityBill.objects.filter(
-        tenant=tenant,
-        status='paid'
-    ).order_by('-due_date')[:10]  # Last 10 paid bills
-
-    overdue_bills = UtilityBill.objects.filter(
-        tenant=tenant,
-        status='overdue'
-    ).order_by('due_date')
+    # Get bills by status, last 10 paid bills
+    bill_summary = tenant_bill_summary(tenant, paid_limit=10)
 
     context = {
-        'unpaid_bills': unpaid_bills,
-        'paid_bills': paid_bills,
-        'overdue_bills': overdue_bills,
+        'unpaid_bills': bill_summary['unpaid'],
+        'paid_bills': bill_summary['paid'],
+        'overdue_bills': bill_summary['overdue'],
+        'bill_counts': bill_summary['counts'],
+        'bill_totals': bill_summary['totals'],
     }
 
     return render(request, 'rent_app/utility_bills.html', context)
@@ -136,62 +188,97 @@ def download_bill(request, bill_id):
         return redirect('/admin/')
 
     tenant = get_object_or_404(Tenant, user=request.user)
-    bill = get_object_or_404(UtilityBill, id=bill_id, tenant=tenant)
+    bill = get_object_or_404(UtilityBill.objects.select_related('utility_type'), id=bill_id, tenant=tenant)
 
     if not bill.bill_file:
         messages.error(request, "No file attached to this bill.")
         return redirect('rent_app:utility_bills')
 
-    # Return the file
-    response = HttpResponse(bill.bill_file.read(), content_type='application/octet-stream')
-    response['Content-Disposition'] = f'attachment; filename="{bill.utility_type.name}_{bill.due_date}.pdf"'
-    return response
+    # Stream the file (or redirect to remote storage) instead of loading it in memory
+    filename = f'{bill.utility_type.name}_{bill.due_date}.pdf'
+    return serve_file(request, bill.bill_file, filename, file_etag(bill.bill_file, bill.updated_at))
 
 
-@login_required
-def meter_readings(request):
-    """Meter readings view"""
-    # Admin users should not access tenant pages
-    if request.user.is_superuser:
-        return redirect('/admin/')
+def _latest_readings(tenant):
+    """Latest reading per meter type, fetched for all meter types in one query"""
+    latest_reading_id = MeterReading.objects.filter(
+        tenant=tenant,
+        meter_type=OuterRef('meter_type')
+    ).order_by('-reading_date').values('id')[:1]
+    return {
+        reading.meter_type_id: reading
+        for reading in MeterReading.objects.filter(
+            tenant=tenant,
+            id=Subquery(latest_reading_id)
+        )
+    }
 
-    tenant = get_object_or_404(Tenant, user=request.user)
 
-    # Get all meter types
-    meter_types = MeterType.objects.filter(is_active=True)
+def _meter_readings_context(latest_readings, meter_types, calendar):
+    """Meter data and the meters whose reading period is open today"""
+    current_date = timezone.localdate()
 
-    # Create meter data with latest readings
     meter_data = []
+    meters_in_period = []
     for meter_type in meter_types:
-        latest_reading = MeterReading.objects.filter(
-            tenant=tenant,
-            meter_type=meter_type
-        ).order_by('-reading_date').first()
-
+        current_period = calendar.current_period(meter_type.id, current_date)
         meter_data.append({
             'meter_type': meter_type,
-            'latest_reading': latest_reading,
+            'latest_reading': latest_readings.get(meter_type.id),
+            'current_period': current_period,
+            'next_period': current_period or calendar.next_period(meter_type.id, current_date),
         })
 
-    # Check if any meter is in reading period
-    current_date = timezone.now().date()
-    current_day = current_date.day
-
-    meters_in_period = []
-    for meter_type in meter_types:
-        in_period = (meter_type.reading_day_start <= current_day <= meter_type.reading_day_end)
-        if in_period:
+        if current_period:
             meters_in_period.append(meter_type)
 
-    context = {
+    return {
         'meter_data': meter_data,
         'meters_in_period': meters_in_period,
         'current_date': current_date,
     }
 
+
+@login_required
+def meter_readings(request):
+    """Meter readings view"""
+    # Admin users should not access tenant pages
+    if request.user.is_superuser:
+        return redirect('/admin/')
+
+    tenant = get_object_or_404(Tenant, user=request.user)
+
+    context = _meter_readings_context(
+        _latest_readings(tenant),
+        list(MeterType.objects.filter(is_active=True)),
+        get_calendar(),
+    )
+
     return render(request, 'rent_app/meter_readings.html', context)
 
 
+@login_required
+def meter_consumption(request):
+    """Monthly consumption per meter with rolling mean and spikes, for tenant charts"""
+    if request.user.is_superuser:
+        return JsonResponse({'error': 'Tenants only'}, status=403)
+
+    tenant = get_object_or_404(Tenant, user=request.user)
+    meter_types = list(MeterType.objects.filter(is_active=True))
+    reports = tenant_consumption_reports(tenant, [meter_type.id for meter_type in meter_types])
+
+    return JsonResponse({
+        'meters': [
+            {
+                'meter_type': meter_type.name,
+                'unit': meter_type.unit,
+                'months': reports[meter_type.id],
+            }
+            for meter_type in meter_types
+        ],
+    })
+
+
 @login_required
 def submit_meter_reading(request):
     """Submit a new meter reading"""
@@ -207,7 +294,11 @@ def submit_meter_reading(request):
 
         try:
             meter_type = MeterType.objects.get(id=meter_type_id, is_active=True)
-            reading_date = timezone.now().date()
+            reading_date = timezone.localdate()
+
+            if not get_calendar().is_open(meter_type.id, reading_date):
+                messages.error(request, f"The {meter_type.name} reading period is not open today.")
+                return redirect('rent_app:meter_readings')
 
             # Check if reading already exists for today
             existing_reading = MeterReading.objects.filter(
@@ -231,17 +322,11 @@ def submit_meter_reading(request):
 
             messages.success(request, f"{meter_type.name} reading submitted successfully!")
 
-            # Send notification email to admin
-            try:
-                send_mail(
-                    subject=f'New Meter Reading Submitted - {meter_type.name}',
-                    message=f'Tenant {tenant.user.get_full_name()} has submitted a new {meter_type.name} reading: {reading_value} {meter_type.unit}',
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[settings.ADMINS[0][1] if settings.ADMINS else 'admin@rentmanager.palko.app'],
-                    fail_silently=True,
-                )
-            except:
-                pass  # Email failure shouldn't break the flow
+            # Queue notification email to admin
+            notify_admins(
+                subject=f'New Meter Reading Submitted - {meter_type.name}',
+                message=f'Tenant {tenant.user.get_full_name()} has submitted a new {meter_type.name} reading: {reading_value} {meter_type.unit}',
+            )
 
         except MeterType.DoesNotExist:
             messages.error(request, "Invalid meter type selected.")
@@ -249,3 +334,43 @@ def submit_meter_reading(request):
             messages.error(request, "Invalid reading value.")
 
     return redirect('rent_app:meter_readings')
+
+
+@login_required
+@require_POST
+def import_meter_readings(request):
+    """Bulk import meter readings from a CSV or JSON upload (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff only'}, status=403)
+
+    # Read the upload (or the raw request body) as a text stream, never as a whole
+    upload = request.FILES.get('file')
+    if upload:
+        stream, name, content_type = upload, upload.name, upload.content_type
+    else:
+        stream, name, content_type = request, '', request.content_type
+    fmt = request.GET.get('format') or detect_format(name, content_type)
+
+    try:
+        report = import_readings(parse_rows(codecs.getreader('utf-8-sig')(stream), fmt))
+    except (ValueError, csv.Error) as exc:
+        # Malformed input: nothing was imported
+        return JsonResponse({'error': f'Could not parse {fmt.upper()} input: {exc}'}, status=400)
+
+    return JsonResponse(report.as_dict())
+
+
+def metrics(request):
+    """Request metrics in Prometheus text format, for staff or with PERF_METRICS_TOKEN"""
+    if not settings.PERF_METRICS:
+        raise Http404
+
+    token = settings.PERF_METRICS_TOKEN
+    authorized = token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not authorized and not request.user.is_staff:
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+
+    return HttpResponse(
+        render_prometheus(metrics_registry.collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,18 @@
+"""
+ASGI config for rentmanager project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with e.g. ``uvicorn rentmanager.asgi:application`` and set
+``ASYNC_VIEWS=True`` to use the async tenant views.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rentmanager.settings')
+
+application = get_asgi_application()
@@ -0,0 +1,11 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rentmanager.settings')
+
+app = Celery('rentmanager')
+
+# Read CELERY_* options from Django settings
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()